@@ -1,19 +1,31 @@
 from typing import Literal
 from gptfunctionutil import GPTFunctionLibrary, AILibFunction, LibParam
-import openai
+from gptfunctionutil import get_shared_async_client, aclose_shared_clients
 import asyncio
+import logging
+import sys
+import time
+
+try:
+    # uvloop is a faster drop in replacement for the default event loop.
+    # Install it with pip install gptfunctionutil[fast]
+    import uvloop
+except ImportError:
+    uvloop = None
 
 """
 
 """
 
+log = logging.getLogger(__name__)
+
 
 class MyLib(GPTFunctionLibrary):
     @AILibFunction(name="wait_for", description="Wait for a few seconds, then return.")
     @LibParam(towait="Number of seconds to wait for.")
     async def wait_for(self, towait: int):
         # Wait for a set period of time.
-        print(f"launcing waitfor for {towait}.")
+        log.info("launching wait_for for %d.", towait)
         await asyncio.sleep(towait)
         return f"waited for {towait}'!"
 
@@ -23,14 +35,16 @@ class MyLib(GPTFunctionLibrary):
     @LibParam(location="The city and state, e.g. San Francisco, CA")
     async def get_weather(self, location: str, unit: Literal["celsius", "fahrenheit"]):
         # get weather in location.
-        print("launcing weather.")
+        log.info("launching get_current_weather for %s.", location)
         return f"weather in {location} is {20} degrees {unit}'!"
 
 
 async def main():
+    logging.basicConfig(level=logging.INFO)
     # Initialize your subclass before calling the API.
 
-    client = openai.AsyncClient()
+    # The shared client keeps its connection pool alive between calls.
+    client = get_shared_async_client()
     mylib = MyLib()
 
     # Call OpenAI's api
@@ -38,15 +52,23 @@ async def main():
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": "Wait for 5 seconds."},
+            # Asking for two things at once makes the model return two tool calls in one response.
+            {"role": "user", "content": "Wait for 5 seconds and also tell me the weather in Boston in C"},
         ],
         tools=mylib.get_tool_schema(),
         tool_choice="auto",
     )
     message = completion.choices[0].message
     if message.tool_calls:
-        for tool in message.tool_calls:
-            result = await mylib.call_by_tool_async(tool)
+        start = time.perf_counter()
+        # Run every tool call concurrently, instead of awaiting them one after another.
+        results = await asyncio.gather(
+            *(mylib.call_by_tool_async(tool) for tool in message.tool_calls), return_exceptions=True
+        )
+        # Sequential version, for comparison:
+        # results = [await mylib.call_by_tool_async(tool) for tool in message.tool_calls]
+        print(f"{len(message.tool_calls)} tool calls finished in {time.perf_counter() - start:.2f}s")
+        for result in results:
             # Print result
             print(result)
     else:
@@ -64,13 +86,31 @@ async def main():
     )
     message = completion.choices[0].message
     if message.tool_calls:
-        for tool in message.tool_calls:
-            result = await mylib.call_by_tool_async(tool)
+        # Run every tool call concurrently, instead of awaiting them one after another.
+        results = await asyncio.gather(
+            *(mylib.call_by_tool_async(tool) for tool in message.tool_calls), return_exceptions=True
+        )
+        for result in results:
             # Print result
             print(result)
     else:
         # Unable to tell that it's a function.
         print(completion.choices[0].message.content)
 
+    await aclose_shared_clients()
+
+
+def run(coro):
+    """Run coro, letting new tasks start eagerly on Python 3.12+."""
+    if sys.version_info >= (3, 12):
+        # Tasks created by asyncio.gather start running right away,
+        # and skip the event loop entirely if they finish without suspending.
+        with asyncio.Runner() as runner:
+            runner.get_loop().set_task_factory(asyncio.eager_task_factory)
+            return runner.run(coro)
+    return asyncio.run(coro)
+
 
-asyncio.run(main())
+if uvloop is not None:
+    uvloop.install()
+run(main())
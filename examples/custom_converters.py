@@ -26,6 +26,9 @@ class User:
 
 """Define the converter for the user class"""
 
+# Compiled once here, rather than every time a mention is converted.
+MENTION_RE = re.compile(r"<@!?(\d+)>")
+
 
 class UserConverter(StringConverter):
     """This converter is for creating a new instance of user by extracting the ID
@@ -34,18 +37,16 @@ class UserConverter(StringConverter):
     def to_schema(self, param: inspect.Parameter, dec: Dict[str, Any]) -> Dict[str, Any]:
         """The regular expression is for ext"""
         schema = super().to_schema(param, dec)
-        schema["pattern"] = r"<@!?(\d+)>"
+        schema["pattern"] = MENTION_RE.pattern
         return schema
 
     def from_schema(self, value: str, schema: Dict[str, Any]) -> Any:
         """Initalize the user object here."""
         value = super().from_schema(value, schema)
-        pat = schema.get("pattern", None)
-        if not pat:
-            raise ValueError("No pattern found.")
-        print(pat)
-        extract = re.match(pat, value)[1]
-        return User(extract)
+        match = MENTION_RE.match(value)
+        if not match:
+            raise ValueError("No mention found.")
+        return User(match[1])
 
 
 """call add_converter before declaring your GPTFunctionLibrary subclass"""
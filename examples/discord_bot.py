@@ -2,10 +2,13 @@ from typing import Any, Literal, Optional
 import discord
 import asyncio
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from discord.ext import commands, tasks
 
-import openai
 
 from gptfunctionutil import *
 
@@ -54,7 +57,7 @@ class AICog(commands.Cog):
         self.mylib = MyLib()
         # Walked indicates that you've previously loaded the bot commands
         # Into your GPTFunctionLibrary subclass.
-        self.client = openai.AsyncClient()
+        self.client = get_shared_async_client()
         self.walked = False
 
     async def ai_message_invoke(self, message: discord.Message):
@@ -154,4 +157,6 @@ async def on_ready():
 
 
 token = "your token here"
+if uvloop is not None:
+    uvloop.install()
 bot.run(token)
@@ -1,15 +1,17 @@
 from typing import List
-from gptfunctionutil import SingleCall
+from gptfunctionutil import SingleCall, SingleCallAsync
 from openai import Client
 from gptfunctionutil import GPTFunctionLibrary, AILibFunction, LibParam, LibParamSpec
 import asyncio
+import logging
 
 
 """Example of the single call utility function along with the use of LibParamSpec for an array."""
 
+log = logging.getLogger(__name__)
 
-class MyCall(GPTFunctionLibrary):
 
+class MyCall(GPTFunctionLibrary):
     @AILibFunction(
         name="followupquestions",
         description="Create a list of follow up questions to expand on a query.",
@@ -17,8 +19,7 @@ class MyCall(GPTFunctionLibrary):
     )
     @LibParamSpec(name="followup", description="A list of followup questions.", minItems=3, maxItems=10)
     def followup_questions(self, followup: List[str]):
-        # Wait for a set period of time.
-        print("foll:", followup)
+        log.info("followup questions: %s", followup)
 
         return followup
 
@@ -34,4 +35,23 @@ def make_query():
     print(command)
 
 
+async def make_query_batch():
+    # SingleCallAsync uses a shared AsyncClient when no client is given.
+    sc = SingleCallAsync(mylib=MyCall())
+    queries = [
+        "What jellyfish species are mostly found in the deep sea?",
+        "How do deep sea fish produce light?",
+        "Why is the ocean floor so cold?",
+    ]
+    # All of the queries are sent at once, so this takes about as long as the slowest one.
+    commands = await sc.call_single_batch(
+        [f'Generate 5 followup questions for "{query}"' for query in queries],
+        "followupquestions",
+    )
+    for command in commands:
+        print(command)
+
+
+logging.basicConfig(level=logging.INFO)
 make_query()
+asyncio.run(make_query_batch())
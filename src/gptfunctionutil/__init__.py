@@ -2,28 +2,61 @@ from __future__ import annotations
 from .logger import logs
 
 __version__ = "0.3.7.2"
+import functools
 import importlib.util
 from .converter_core import *
 from .convertutil import add_converter, ConvertStatic
 from .errors import *
 from .functionlib import LibParam, LibParamSpec
+from .single_call import (
+    SingleCall,
+    SingleCallAsync,
+    get_shared_client,
+    get_shared_async_client,
+    aclose_shared_clients,
+)
 
-discord_install = importlib.util.find_spec("discord")
-if discord_install is not None:
-    try:
-        import discord
-
-        logs.info("Importing discord variant.")
-        from .functionlib_discord import (
-            LibCommandDisc as LibCommand,
-            GPTFunctionLibraryDisc as GPTFunctionLibrary,
-            AILibFunction,
-        )
-    except ImportError:
-        logs.warning("Something went wrong importing discord.")
-        from .functionlib import LibCommand, GPTFunctionLibrary, AILibFunction
-else:
-    logs.info("Importing core variant.")
+_LAZY_NAMES = ("LibCommand", "GPTFunctionLibrary", "AILibFunction")
+
+
+@functools.cache
+def _resolve_variant():
+    """Pick the discord or core variant of the library classes, probing for discord only once."""
+    if importlib.util.find_spec("discord") is not None:
+        try:
+            import discord
+
+            logs.info("Importing discord variant.")
+            from .functionlib_discord import (
+                LibCommandDisc as LibCommand,
+                GPTFunctionLibraryDisc as GPTFunctionLibrary,
+                AILibFunction,
+            )
+
+            return LibCommand, GPTFunctionLibrary, AILibFunction
+        except ImportError:
+            logs.warning("Something went wrong importing discord.")
+    else:
+        logs.info("Importing core variant.")
     from .functionlib import LibCommand, GPTFunctionLibrary, AILibFunction
 
-from .single_call import SingleCall, SingleCallAsync
+    return LibCommand, GPTFunctionLibrary, AILibFunction
+
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        value = _resolve_variant()[_LAZY_NAMES.index(name)]
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "SingleCall",
+    "SingleCallAsync",
+    "get_shared_client",
+    "get_shared_async_client",
+    "aclose_shared_clients",
+    *_LAZY_NAMES,
+]
+__all__ += [name for name in globals() if not name.startswith("_") and name not in __all__]
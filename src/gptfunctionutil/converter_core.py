@@ -1,6 +1,7 @@
 from .logger import logs
+import functools
 import inspect
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Union, get_args, get_origin
 from inspect import Parameter
 import re
 from datetime import datetime
@@ -8,6 +9,53 @@ from datetime import datetime
 from .errors import ConversionError, ConversionAddError, ConversionToError, ConversionFromError
 
 
+# strptime layout for the "date-time" format, used when fromisoformat can't read a value.
+_DT_FMT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a schema's pattern keyword once, and reuse it for every later validation."""
+    return re.compile(pattern)
+
+
+def _fits_dt_layout(value: str) -> bool:
+    """Check that value is laid out exactly like _DT_FMT with a Z, +HHMM or +HH:MM offset."""
+    return (
+        len(value) in (20, 24, 25)
+        and value[4] == value[7] == "-"
+        and value[10] == "T"
+        and value[13] == value[16] == ":"
+        and value[19] in "+-Z"
+    )
+
+
+def _parse_datetime(value: str, datetime_format: str) -> datetime:
+    """Parse value as a datetime.
+
+    datetime.fromisoformat is much faster than strptime, but accepts more layouts, so it's
+    only tried on values shaped like _DT_FMT; everything else is left to strptime."""
+    if datetime_format == _DT_FMT and _fits_dt_layout(value):
+        try:
+            parsed = datetime.fromisoformat(value)
+            if parsed.tzinfo is not None:
+                return parsed
+        except ValueError:
+            pass
+    return datetime.strptime(value, datetime_format)
+
+
+# Item schema templates for the element types ArrayConverter understands.
+# ArrayConverter hands out copies, so schemas built from them never alias these dicts.
+_EMPTY_SCHEMA: Dict[str, Any] = {}
+_PRIMITIVE_SCHEMAS: Dict[type, Dict[str, Any]] = {
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    str: {"type": "string"},
+    bool: {"type": "boolean"},
+}
+
+
 class Converter:
     """
     To convert parameter signatures into a JSON Schema friendly representaion, and to
@@ -52,12 +100,35 @@ class Converter:
         """
         raise NotImplementedError("Derived classes need to implement this.")
 
+    def specialize(self, schema: Dict[str, Any]) -> Callable[[Any], Any]:
+        """
+        Get a function that validates and converts values against one fixed schema.
+        Converters can override this to check only the keywords present in schema,
+        instead of testing for each of them on every call.
+
+        Parameters
+        -----------
+        schema: :class:`Dict[str,Any]`
+            The schema every value passed to the returned function will be validated with.
+        Returns
+        --------
+            `Callable[[Any], Any]`: Equivalent to calling from_schema with schema.
+        """
+        from_schema = self.from_schema
+
+        def validate(value: Any) -> Any:
+            return from_schema(value, schema)
+
+        return validate
+
 
 class BooleanConverter(Converter):
     """
     This converter is for Boolean values.
     """
 
+    _BASE: Dict[str, Any] = {"type": "boolean"}
+
     def to_schema(self, param: inspect.Parameter, dec: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate a boolean type schema from a parameter signature.
@@ -74,11 +145,11 @@ class BooleanConverter(Converter):
         Raises
         -------
         """
-        schema: Dict[str, Any] = {"type": "boolean"}
-        return schema
+        return self._BASE.copy()
 
     def from_schema(self, value: Any, schema: Dict[str, Any]) -> bool:
-        if not isinstance(value, bool):
+        # True and False are singletons, and bool can't be subclassed.
+        if value is not True and value is not False:
             raise ValueError("Value is not of type 'bool'.")
 
         return value
@@ -88,6 +159,8 @@ class StringConverter(Converter):
     """This converter is for string types, as well as custom types that can be derived from strings,
     such as datetimes."""
 
+    _BASE: Dict[str, Any] = {"type": "string"}
+
     def to_schema(self, param: inspect.Parameter, dec: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate a schema (for a string type) from a parameter signature and declare additonal keywords.
@@ -105,12 +178,13 @@ class StringConverter(Converter):
         Raises
         -------
         """
-        schema: Dict[str, Any] = {"type": "string"}
+        schema = self._BASE.copy()
 
         # Check for length constraints
-        if "minLength" in dec or param.default is None:
+        default_none = param.default is None
+        if default_none or "minLength" in dec:
             schema["minLength"] = dec.get("minLength", 0)
-        if "maxLength" in dec or param.default is None:
+        if default_none or "maxLength" in dec:
             schema["maxLength"] = dec.get("maxLength", 255)
 
         # Check for pattern constraint
@@ -145,11 +219,32 @@ class StringConverter(Converter):
         if "maxLength" in schema and len(value) > schema["maxLength"]:
             raise ValueError("Value exceeds the maxLength constraint.")
 
-        if "pattern" in schema and not re.match(schema["pattern"], value):
+        if "pattern" in schema and not _compile_pattern(schema["pattern"]).match(value):
             raise ValueError("Value does not match the specified pattern.")
 
         return value
 
+    def specialize(self, schema: Dict[str, Any]) -> Callable[[Any], Any]:
+        """Get a validator that only checks the length and pattern keywords present in schema."""
+        if type(self).from_schema is not StringConverter.from_schema:
+            return super().specialize(schema)
+        min_length = schema.get("minLength")
+        max_length = schema.get("maxLength")
+        pattern = _compile_pattern(schema["pattern"]) if "pattern" in schema else None
+
+        def validate(value: Any) -> str:
+            if not isinstance(value, str):
+                raise ValueError("Value is not of type 'str'.")
+            if min_length is not None and len(value) < min_length:
+                raise ValueError("Value does not meet the minLength constraint.")
+            if max_length is not None and len(value) > max_length:
+                raise ValueError("Value exceeds the maxLength constraint.")
+            if pattern is not None and not pattern.match(value):
+                raise ValueError("Value does not match the specified pattern.")
+            return value
+
+        return validate
+
 
 class DatetimeConverter(StringConverter):
     """This converter is for datetime objects, which are derived from a string."""
@@ -198,14 +293,15 @@ class DatetimeConverter(StringConverter):
         if not form:
             raise ValueError("No format found.")
         if form == "date-time":
-            datetime_format = "%Y-%m-%dT%H:%M:%S%z"
-            converted_datetime = datetime.strptime(value, datetime_format)
-            newvalue = converted_datetime
-            return newvalue
+            return _parse_datetime(value, _DT_FMT)
         else:
             raise ValueError('Format is not "date-time" ')
 
 
+# Every keyword NumericConverter.from_schema validates against.
+_NUMERIC_CONSTRAINTS = frozenset(("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf"))
+
+
 class NumericConverter(Converter):
     """This Converter is for floats and integers"""
 
@@ -266,6 +362,10 @@ class NumericConverter(Converter):
         if not isinstance(value, (int, float)):
             raise ValueError("Value is not of type 'int' or 'float'.")
 
+        if schema.keys().isdisjoint(_NUMERIC_CONSTRAINTS):
+            # Most numeric parameters have no constraints at all.
+            return value
+
         if "minimum" in schema and value < schema["minimum"]:
             raise ValueError("Value is below the minimum constraint.")
 
@@ -283,10 +383,47 @@ class NumericConverter(Converter):
 
         return value
 
+    def specialize(self, schema: Dict[str, Any]) -> Callable[[Any], Any]:
+        """Get a validator that only checks the numeric constraints present in schema."""
+        if type(self).from_schema is not NumericConverter.from_schema:
+            return super().specialize(schema)
+        checks = []
+        if "minimum" in schema:
+            minimum = schema["minimum"]
+            checks.append((lambda value: value < minimum, "Value is below the minimum constraint."))
+        if "maximum" in schema:
+            maximum = schema["maximum"]
+            checks.append((lambda value: value > maximum, "Value exceeds the maximum constraint."))
+        if "exclusiveMinimum" in schema:
+            exclusive_minimum = schema["exclusiveMinimum"]
+            checks.append(
+                (lambda value: value <= exclusive_minimum, "Value does not meet the exclusiveMinimum constraint.")
+            )
+        if "exclusiveMaximum" in schema:
+            exclusive_maximum = schema["exclusiveMaximum"]
+            checks.append(
+                (lambda value: value >= exclusive_maximum, "Value does not meet the exclusiveMaximum constraint.")
+            )
+        if "multipleOf" in schema:
+            multiple_of = schema["multipleOf"]
+            checks.append((lambda value: value % multiple_of != 0, "Value does not meet the multipleOf constraint."))
+
+        def validate(value: Any) -> Union[float, int]:
+            if not isinstance(value, (int, float)):
+                raise ValueError("Value is not of type 'int' or 'float'.")
+            for failed, msg in checks:
+                if failed(value):
+                    raise ValueError(msg)
+            return value
+
+        return validate
+
 
 class ArrayConverter(Converter):
     """This Converter is for Arrays.  Currenly only works on 1D lists."""
 
+    _BASE: Dict[str, Any] = {"type": "array"}
+
     def to_schema(self, param: inspect.Parameter, dec: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate an array schema for a List or Tuple.
@@ -306,18 +443,16 @@ class ArrayConverter(Converter):
         Raises
         -------
         """
-        schema: Dict[str, Any] = {"type": "array"}
-        if param.annotation == list or getattr(param.annotation, "__origin__", None) == list:
-            # Check if the annotation is 'list' or an instance of the 'List' type hint from typing module
-            schema["items"] = {}
-            element_type = getattr(param.annotation, "__args__", [Any])[0]
-            schema["items"] = self._get_type_schema(element_type)
-
-        elif param.annotation == Tuple or getattr(param.annotation, "__origin__", None) == Tuple:
-            prefix_items = []
-            for item_type in getattr(param.annotation, "__args__", [Any]):
-                prefix_items.append(self._get_type_schema(item_type))
-            schema["prefixItems"] = prefix_items
+        schema = self._BASE.copy()
+        annotation = param.annotation
+        # list, List and List[str] all have list as their origin, likewise for tuple.
+        origin = get_origin(annotation) or annotation
+        args = get_args(annotation) or (Any,)
+        if origin is list:
+            schema["items"] = self._get_type_schema(args[0])
+
+        elif origin is tuple:
+            schema["prefixItems"] = [self._get_type_schema(item_type) for item_type in args]
 
         # Length constraints
         if "minItems" in dec:
@@ -351,29 +486,27 @@ class ArrayConverter(Converter):
         if not isinstance(value, list):
             raise ValueError("Value is not of type 'list'.")
 
-        if "minItems" in schema and len(value) < schema["minItems"]:
+        length = len(value)
+        if "minItems" in schema and length < schema["minItems"]:
             raise ValueError("Value does not meet the minItems constraint.")
 
-        if "maxItems" in schema and len(value) > schema["maxItems"]:
+        if "maxItems" in schema and length > schema["maxItems"]:
             raise ValueError("Value exceeds the maxItems constraint.")
 
-        if "uniqueItems" in schema and schema["uniqueItems"] is True:
-            if len(set(value)) != len(value):
-                raise ValueError("Value does not meet the uniqueItems constraint.")
+        if schema.get("uniqueItems") is True:
+            # Stop at the first duplicate, instead of hashing the whole list.
+            seen = set()
+            add = seen.add
+            for item in value:
+                if item in seen:
+                    raise ValueError("Value does not meet the uniqueItems constraint.")
+                add(item)
 
         return value
 
     def _get_type_schema(self, item_type: type) -> Dict[str, Any]:
-        if item_type == int:
-            return {"type": "integer"}
-        elif item_type == float:
-            return {"type": "number"}
-        elif item_type == str:
-            return {"type": "string"}
-        elif item_type == bool:
-            return {"type": "boolean"}
-        else:
-            return {}  # Empty schema for custom types
+        """Get a new item schema for item_type, or an empty schema for custom types."""
+        return _PRIMITIVE_SCHEMAS.get(item_type, _EMPTY_SCHEMA).copy()
 
 
 class LiteralConverter(Converter):
@@ -399,12 +532,12 @@ class LiteralConverter(Converter):
         Raises
         -------
         """
-        schema: Dict[str, Any] = {}
-        literal_values = param.annotation.__args__
-        schema["type"] = "string"
-        schema["enum"] = literal_values
-        schema.update(dec)
-        return schema
+        # Additional keywords can't replace the type or the enum taken from the Literal.
+        return {
+            "type": "string",
+            "enum": param.annotation.__args__,
+            **{key: value for key, value in dec.items() if key not in ("type", "enum")},
+        }
 
     def from_schema(self, value: Any, schema: Dict[str, Any]) -> Any:
         """
@@ -1,24 +1,101 @@
 from .logger import logs
 import inspect
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from inspect import Parameter
 import re
 from datetime import datetime
-from typing import Type, TypeVar
+from typing import Literal, Type, TypeVar, get_origin
 
 from .errors import ConversionError, ConversionAddError, ConversionToError, ConversionFromError
 from .converter_core import *
 
 to_ignore = ["_empty", "Context"]
+# The converter for each type name.  This is the only place converters are registered, entries may be
+# Converter classes or instances, and replacing one here changes the converter used for that type.
+_numeric_converter = NumericConverter()
 substitutions = {
-    "str": StringConverter,
-    "int": NumericConverter,
-    "bool": BooleanConverter,
-    "float": NumericConverter,
-    "datetime": DatetimeConverter,
-    "Literal": LiteralConverter,
-    "List": ArrayConverter,
+    "str": StringConverter(),
+    "int": _numeric_converter,
+    "bool": BooleanConverter(),
+    "float": _numeric_converter,
+    "datetime": DatetimeConverter(),
+    "Literal": LiteralConverter(),
+    "List": ArrayConverter(),
 }
+# The substitutions name for each annotation type object, so most lookups skip building the name.
+names_by_type = {
+    str: "str",
+    int: "int",
+    bool: "bool",
+    float: "float",
+    datetime: "datetime",
+    list: "List",
+    tuple: "List",
+}
+# The substitutions name for generic aliases like List[str] or Literal['a','b'], keyed by typing.get_origin.
+names_by_origin = {
+    list: "List",
+    tuple: "List",
+    Literal: "Literal",
+}
+# One shared instance for each Converter class placed in substitutions.
+_converter_instances: Dict[type, Converter] = {}
+
+
+# Finished parameter schemas, keyed by the parameter signature, its decorator keywords and its converter,
+# so a converter replaced in substitutions never gets another converter's schema.
+_schema_cache: Dict[tuple, Dict[str, Any]] = {}
+
+
+def _schema_cache_key(param: inspect.Parameter, decs: Dict[str, Any], converter: Converter) -> Optional[tuple]:
+    """Get the _schema_cache key for param, decs and converter, or None if any are unhashable."""
+    key = (param, tuple(sorted(decs.items())), converter)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _copy_schema(schema: Any) -> Any:
+    """Copy the dicts and lists in a JSON schema, which is all a schema holds, much faster than copy.deepcopy."""
+    if isinstance(schema, dict):
+        return {key: _copy_schema(value) for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [_copy_schema(value) for value in schema]
+    return schema
+
+
+def find_converter(annotation: Any) -> Optional[Converter]:
+    """
+    Get the converter in substitutions for annotation, found by its type object, the origin of a generic alias,
+    or its name.
+
+    Parameters:
+        annotation (Any): The annotation of a parameter.
+
+    Returns:
+        Optional[Converter]: The converter instance, or None if there's no converter for that annotation.
+    """
+    try:
+        typename = names_by_type.get(annotation)
+        if typename is None:
+            typename = names_by_origin.get(get_origin(annotation))
+    except TypeError:
+        # Unhashable annotations can't have been registered by type.
+        typename = None
+    if typename is None:
+        # Fall back to looking up the converter by name.
+        if isinstance(annotation, str):
+            typename = annotation  # Treat the string annotation as a regular string
+        else:
+            typename = getattr(annotation, "__name__", None)  # Access the __name__ attribute of the type object
+    converter = substitutions.get(typename)
+    if isinstance(converter, type):
+        if converter not in _converter_instances:
+            _converter_instances[converter] = converter()
+        converter = _converter_instances[converter]
+    return converter
 
 
 def add_converter(fortype: Type, converterclass: Type[Converter]) -> None:
@@ -30,6 +107,7 @@ def add_converter(fortype: Type, converterclass: Type[Converter]) -> None:
         fortype (Type): The Class the converter will creates schema for and create new
         instances of on validation
         converterclass (Type[Converter]): The class descended from Converter.
+        It's instantiated once here, and the instance is shared by every parameter of type fortype.
 
     Raises:
         ConversionAddError: If the type already exists in the dictionary.
@@ -40,8 +118,10 @@ def add_converter(fortype: Type, converterclass: Type[Converter]) -> None:
     typename = fortype.__name__  # Access the name attribute of the type object
 
     if typename not in substitutions:
-        substitutions[typename] = converterclass
-        logs.info(f"Adding converterclass %s for type %s", typename, converterclass)
+        converter = converterclass()
+        substitutions[typename] = converter
+        names_by_type[fortype] = typename
+        logs.info("Adding converterclass %s for type %s", typename, converterclass)
     else:
         raise ConversionAddError(f"{typename} already in dictionary!")
 
@@ -52,7 +132,7 @@ class ConvertStatic:
     @staticmethod
     def parameter_into_schema(
         param_name: str, param: inspect.Parameter, dec: Union[str, Dict[str, any]]
-    ) -> Tuple[Dict[str, any], Type[Converter]]:
+    ) -> Tuple[Dict[str, any], Converter]:
         """
         Converts a parameter signature into a schema.
 
@@ -63,7 +143,7 @@ class ConvertStatic:
             including definition
 
         Returns:
-            Tuple[Dict[str, any], Type[Converter]]: The schema generated along with the Converter Class.
+            Tuple[Dict[str, any], Converter]: The schema generated along with the Converter instance.
 
         Raises:
         ConversionToError: If conversion to schema fails.
@@ -71,30 +151,39 @@ class ConvertStatic:
         decs = dec
         if isinstance(dec, str):
             decs = {"description": dec}
-        if isinstance(param.annotation, str):
-            typename = param.annotation  # Treat the string annotation as a regular string
-        else:
-            typename = param.annotation.__name__  # Access the __name__ attribute of the type object
-
-        oldtypename = typename
-        converter = None
-        if typename in substitutions:
-            converter = substitutions[typename]
-        else:
-            logs.info(f"type %s was not found!  Param is %s", typename, param_name)
+        converter = find_converter(param.annotation)
+        if converter is None:
+            logs.info("type %s was not found!  Param is %s", param.annotation, param_name)
             return None, None
-        param_info = {}
-        if decs.get("description", ""):
-            param_info["description"] = decs.get("description", "")
-        mod = converter().to_schema(param, decs)
-        if mod == None:
-            raise ConversionToError(param_name, param, dec)
-        param_info.update(mod)
-        logs.info(f"schema generated for param %s with type %s!", param_name, typename)
-        return param_info, converter
+        key = _schema_cache_key(param, decs, converter)
+        if key is None:
+            return ConvertStatic._build_param_schema(param_name, param, decs, converter), converter
+        if key not in _schema_cache:
+            _schema_cache[key] = ConvertStatic._build_param_schema(param_name, param, decs, converter)
+        # Copied so callers never share (and mutate) the cached schema, or each other's.
+        return _copy_schema(_schema_cache[key]), converter
+
+    @staticmethod
+    def _build_param_schema(
+        param_name: str, param: inspect.Parameter, decs: Dict[str, any], converter: Converter
+    ) -> Dict[str, any]:
+        """Generate the schema for parameter_into_schema with converter, without consulting the cache."""
+        mod = converter.to_schema(param, decs)
+        if mod is None:
+            raise ConversionToError(param_name, param, decs)
+        description = decs.get("description")
+        param_info = {"description": description, **mod} if description else mod
+        logs.info("schema generated for param %s with type %s!", param_name, param.annotation)
+        return param_info
 
     @staticmethod
-    def schema_validate(param_name: str, value: any, schema: Union[str, Dict[str, any]], converter: Converter) -> Any:
+    def schema_validate(
+        param_name: str,
+        value: any,
+        schema: Union[str, Dict[str, any]],
+        converter: Converter,
+        validator: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
         """
         Validate and apply any needed conversions to value based on schema.
 
@@ -102,7 +191,10 @@ class ConvertStatic:
         param_name (str): The name of the parameter.
         value (any): The value to validate.
         schema (Union[str, Dict[str, any]]): The schema to validate against.
-        converter (Converter): The converter to use for validation.
+        converter (Converter): The converter instance to use for validation.
+        A Converter class is also accepted, and will be instantiated.
+        validator (Optional[Callable[[Any], Any]]): A function from converter.specialize(schema).
+        If given, it's used instead of converter.from_schema.
 
         Returns:
         any: The validated value.
@@ -112,18 +204,17 @@ class ConvertStatic:
         """
         ...
         typename = None
-        if converter != None:
-            typename = converter
+        if converter is not None:
+            typename = converter() if isinstance(converter, type) else converter
         else:
             error = ConversionFromError(param_name, value, schema, msg="No converter found.")
             logs.error(error, exc_info=1, stack_info=True)
             raise error
         try:
-            mod = typename().from_schema(value, schema)
+            if validator is not None:
+                return validator(value)
+            return typename.from_schema(value, schema)
         except Exception as e:
-            try:
-                raise ConversionFromError(param_name, value, schema, str(e)) from e
-            except Exception as e:
-                logs.error(e, exc_info=1, stack_info=True)
-                raise e
-        return mod
+            error = ConversionFromError(param_name, value, schema, str(e))
+            logs.error(error, exc_info=e, stack_info=True)
+            raise error from e
@@ -30,7 +30,7 @@ class ArgDecodeError(GPTLibError):
         self.arguments = arguments
         output = f" {er.msg} at line {er.lineno} column {er.colno}: `{arguments[er.pos]}`"
         message = f"ArgDecodeError for '{function_name}': {output} \n {arguments}"
-        super().__init__(message, **kwargs)
+        super().__init__(message)
 
 
 class InvalidFuncArg(GPTLibError):
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 
+import asyncio
+import functools
 import inspect
 import json
+import logging
 import re
-from typing import Any, Coroutine, Dict, List, Union
+import weakref
+from typing import Any, Coroutine, Dict, List, Optional, Tuple, Union
 
 from enum import Enum, EnumMeta
 
@@ -14,12 +18,57 @@ from .errors import *
 from .convertutil import ConvertStatic
 from .logger import logs
 
-from .util import parse_expression
+from .util import parse_expression, dumps_json, loads_json, for_running_loop
+
+
+# Matches string values containing unescaped quotes, see parse_name_args.
+_QUOTE_FIX_RE = re.compile(r"(?<=:\s\")(.*?)(?=\"(?:,|\s*\}))")
+# Matches values that are arithmetic expressions rather than literals, see expression_match.
+_EXPR_RE = re.compile(r'(?<=:\s)([^"]*?[+\-*/][^"]*?)(?=(?:,|\s*\}))')
+# Both of the above, so the two repairs can be applied in one pass when do_expression is set.
+_REPAIR_RE = re.compile(f"(?P<quote>{_QUOTE_FIX_RE.pattern})|(?P<expr>{_EXPR_RE.pattern})")
+
+
+def _repair_match(match: re.Match) -> str:
+    if match.lastgroup == "quote":
+        return match.group().replace('"', r"\"")
+    return str(parse_expression(match.group()))
+
+
+# Marks a parameter with no default value.
+_EMPTY = inspect.Parameter.empty
+
+
+def _new_function_schema(name: str, description: str, strict: bool) -> Dict[str, Any]:
+    """Return a function schema with an empty parameters object, for param_iterate to fill in."""
+    return {
+        "name": name,
+        "description": description,
+        "parameters": {"type": "object", "properties": {}, "required": []},
+        "strict": strict,
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _signature(func: Union[callable, Coroutine]) -> inspect.Signature:
+    """
+    Get the signature of func, resolving string annotations (such as the ones made by
+    `from __future__ import annotations`) into objects when possible.
+    The most recent signatures are cached, as they are looked up again whenever a function is wrapped.
+    """
+    try:
+        return inspect.signature(func, eval_str=True)
+    except Exception:
+        # Annotations that can't be resolved are left as strings.
+        return inspect.signature(func)
+
+
+_commands: Dict[str, Any] = {}
 
 
 class CommandSingleton:
     _instance = None
-    _commands = {}
+    _commands = _commands
 
     @classmethod
     def get_instance(cls):
@@ -27,13 +76,9 @@ class CommandSingleton:
             cls._instance = cls()
         return cls._instance
 
-    @staticmethod
-    def add_command(name, command):
-        CommandSingleton._commands[name] = command
-
-    @staticmethod
-    def load_command(name):
-        return CommandSingleton._commands.get(name, None)
+    # Bound straight to the registry's dict methods, so each call is a single C call.
+    add_command = staticmethod(_commands.__setitem__)
+    load_command = staticmethod(_commands.get)
 
 
 class LibCommand:
@@ -41,6 +86,31 @@ class LibCommand:
      LibParam and the AILibFunction decorators,
     wrapping them up with attributes that help the GPTFunctionLibary invoke them."""
 
+    __slots__ = (
+        "command",
+        "internal_name",
+        "function_name",
+        "comm_type",
+        "function_schema",
+        "tool_schema",
+        "required",
+        "param_converters",
+        "_param_entries",
+        "strict",
+        "serialize",
+        "_enabled",
+        "_force_words",
+        "_force_regex",
+        "_escaped_force_words",
+        "_schema_json",
+    )
+
+    # Incremented whenever any LibCommand is enabled or disabled,
+    # so GPTFunctionLibrary knows when its cached schema lists are stale.
+    _schema_version = 0
+    # Likewise, incremented whenever any LibCommand's force words change.
+    _force_words_version = 0
+
     def __init__(
         self,
         func: Union[callable, Coroutine],
@@ -50,6 +120,7 @@ class LibCommand:
         force_words: List[str] = [],
         enabled=True,
         strict=False,
+        serialize=False,
     ):
         """
         This class represents a library command. It encapsulates a callable method/coroutine,
@@ -62,6 +133,8 @@ class LibCommand:
             required (List[str], optional): A list of required parameter names. Defaults to an empty list.
             force_words (List[str], optional): A list of force words. Defaults to an empty list.
             enabled (bool, optional): Indicates whether the command is enabled. Defaults to True.
+            serialize (bool, optional): If True, the command is not reentrant and concurrent async calls
+                will be run one at a time. Defaults to False.
         """
         self.command = func
         self.internal_name = self.function_name = name
@@ -70,22 +143,48 @@ class LibCommand:
         if inspect.iscoroutinefunction(func):
             self.comm_type = "coroutine"
         logs.info("initalizing %s, comm type is %s", self.function_name, self.comm_type)
-        my_schema = {
-            "name": self.function_name,
-            "description": description,
-            "parameters": {"type": "object", "properties": {}, "required": []},
-            "strict": strict,
-        }
-
-        self.function_schema = my_schema
+        self.function_schema = _new_function_schema(self.function_name, description, strict)
+        # Shares function_schema, so it stays current as parameters are added.
+        self.tool_schema = {"type": "function", "function": self.function_schema}
         self.required = required
 
+        self._schema_json: str = None
         self.param_converters = {}
+        # (schema, converter, specialized validator) for each parameter, built on first use by convert_args.
+        self._param_entries = {}
         self.param_iterate()
 
         self.enabled = enabled
         self.force_words = force_words
         self.strict = strict
+        self.serialize = serialize
+
+    @property
+    def enabled(self) -> bool:
+        """Whether this command will be included in the schema sent to the AI."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        self._enabled = value
+        LibCommand._schema_version += 1
+
+    @property
+    def force_words(self) -> List[str]:
+        """Words that force this command to be called.  Assign a new list to change them."""
+        return self._force_words
+
+    @force_words.setter
+    def force_words(self, words: List[str]):
+        self._force_words = words
+        # Escaped once here and reused whenever a library rebuilds its combined force word pattern.
+        self._escaped_force_words = tuple(map(re.escape, words))
+        # Compiled here, so check_force doesn't have to rebuild the pattern for every query.
+        self._force_regex = None
+        if words:
+            pattern = r"\b(?:{})\b".format("|".join(self._escaped_force_words))
+            self._force_regex = re.compile(pattern, re.IGNORECASE)
+        LibCommand._force_words_version += 1
 
     def param_iterate(self):
         """
@@ -94,50 +193,24 @@ class LibCommand:
         Every parameter that is not decorated with a valid type will not be added!
         """
         func = self.command
-        paramdict = {}
-        param_decorators = {}
-
-        sig = inspect.signature(func)
-        if hasattr(func, "parameter_decorators"):
-            paramdict = sig.parameters
-            param_decorators = func.parameter_decorators
+        if not hasattr(func, "parameter_decorators"):
+            # Without LibParam or LibParamSpec, no parameters are added.
+            return
+        paramdict = _signature(func).parameters
+        param_decorators = func.parameter_decorators
 
-        self.function_schema.update({"parameters": {"type": "object", "properties": {}, "required": []}})
+        # Filled in place; __init__ has already set up the empty parameters skeleton.
+        parameters = self.function_schema["parameters"]
         for param_name, param in paramdict.items():
-            decs = param_decorators.get(param_name, "")
+            decs = param_decorators.get(param_name, {})
 
             param_info, converter = ConvertStatic.parameter_into_schema(param_name, param, dec=decs)
 
             if param_info is not None:
                 self.param_converters[param_name] = converter
-                self.function_schema["parameters"]["properties"][param_name] = param_info
-                if param.default == inspect.Parameter.empty or param_name in self.required:
-                    self.function_schema["parameters"]["required"].append(param_name)
-
-            # if isinstance(param.annotation, str):
-            #     typename = param.annotation  # Treat the string annotation as a regular string
-            # else:
-            #     typename = param.annotation.__name__  # Access the __name__ attribute of the type object
-
-            # oldtypename=typename
-            # if typename in substitutions:
-            #     typename=substitutions[typename]
-            # else:
-            #     continue
-            # param_info = {
-            #     'type': typename,
-            #     'description': param_decorators.get(param_name, '')
-            # }
-            # if typename in to_ignore:
-            #     continue
-            # if oldtypename== 'datetime':
-            #     param_info['format']='date-time'
-            # if oldtypename == 'Literal':
-            #     literal_values = param.annotation.__args__
-            #     param_info['enum'] = literal_values
-            # self.function_schema['parameters']['properties'][param_name] = param_info
-            # if param.default == inspect.Parameter.empty or param_name in self.required:
-            #     self.function_schema['parameters']['required'].append(param_name)
+                parameters["properties"][param_name] = param_info
+                if param.default is _EMPTY or param_name in self.required:
+                    parameters["required"].append(param_name)
 
     def convert_args(self, function_args: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and convert all arguments within function_args
@@ -150,19 +223,81 @@ class LibCommand:
         Returns:
             Dict[str, Any]: The converted function argument dictionary.
         """
-        schema = self.function_schema
-        parameters = schema["parameters"]
-        logs.info("converting args for function %s, args:%s", self.function_name, function_args)
+        if not self.param_converters:
+            # Nothing to validate.
+            return function_args
+        entries = self._param_entries
+        # Checked once, rather than formatting a log call for every argument.
+        log_info = logs.isEnabledFor(logging.INFO)
+        if log_info:
+            logs.info("converting args for function %s, args:%s", self.function_name, function_args)
+
+        # The model usually returns fewer arguments than there are parameters, so loop over those.
+        # Only existing keys are reassigned, so function_args can be updated while iterating.
+        for i, value in function_args.items():
+            entry = entries.get(i)
+            if entry is None:
+                converter = self.param_converters.get(i)
+                if converter is None:
+                    continue
+                v = self.function_schema["parameters"]["properties"][i]
+                entry = entries[i] = (v, converter, converter.specialize(v))
+            v, converter, validator = entry
+
+            result = ConvertStatic.schema_validate(i, value, v, converter, validator)
+
+            if log_info:
+                logs.info("arg %s converted into %s", i, result)
+            function_args[i] = result
+        return function_args
 
-        for i, v in parameters["properties"].items():
-            if i in function_args:
-                converter = self.param_converters[i]
+    @property
+    def schema_json(self) -> str:
+        """function_schema encoded as JSON, computed on first use."""
+        if self._schema_json is None:
+            self._schema_json = dumps_json(self.function_schema)
+        return self._schema_json
 
-                result = ConvertStatic.schema_validate(i, function_args[i], v, converter)
+    def invoke(self, owner: Any, function_args: Dict[str, Any]) -> Any:
+        """
+        Convert function_args and call the wrapped method with them.
 
-                logs.info("arg %s converted into %s", i, result)
-                function_args[i] = result
-        return function_args
+        Args:
+            owner (Any): The GPTFunctionLibrary instance the method is bound to.
+            function_args (Dict[str, Any]): The parsed function arguments.
+
+        Returns:
+            The result of the method.
+
+        Raises:
+            AttributeError: If the wrapped function is not a plain callable.
+        """
+        if self.comm_type != "callable":
+            raise AttributeError(f"Method '{self.function_name}' not found or not callable.")
+        if not function_args:
+            # Nothing to convert or unpack.
+            return self.command(owner)
+        return self.command(owner, **self.convert_args(function_args))
+
+    async def invoke_async(self, owner: Any, function_args: Dict[str, Any]) -> Any:
+        """
+        Convert function_args and call the wrapped method or coroutine with them.
+
+        Args:
+            owner (Any): The GPTFunctionLibrary instance the method is bound to.
+            function_args (Dict[str, Any]): The parsed function arguments.
+
+        Returns:
+            The result of the method, awaited if it's a coroutine.
+
+        Raises:
+            AttributeError: If the wrapped function is neither a callable nor a coroutine.
+        """
+        if self.comm_type == "coroutine":
+            if not function_args:
+                return await self.command(owner)
+            return await self.command(owner, **self.convert_args(function_args))
+        return self.invoke(owner, function_args)
 
     def check_force(self, query: str) -> bool:
         """
@@ -175,13 +310,7 @@ class LibCommand:
 
             bool: True if the query contains force words, False otherwise.
         """
-        if self.force_words:
-            pattern = r"\b(?:{})\b".format("|".join(map(re.escape, self.force_words)))
-            regex = re.compile(pattern, re.IGNORECASE)
-            match = regex.search(query)
-            if match:
-                return True
-        return False
+        return self._force_regex is not None and self._force_regex.search(query) is not None
 
 
 class GPTFunctionLibrary:
@@ -189,9 +318,9 @@ class GPTFunctionLibrary:
     A collection of methods to be used with OpenAI's chat completion endpoint.
     When subclassed, decorated methods, called LibCommands, will be added to an internal FunctionDict along with
     a special LibCommand object
-    All methods will be converted to a function schema dictionary, which will be sent to OpenAI along with any user text.
-    OpenAI will then format paramaters and return them within a JSON object, which will be used to trigger the method
-    with call_by_dict or call_by_dict_ctx for discord.py Bot Commands.
+    All methods will be converted to a function schema dictionary, which will be sent to OpenAI along with any user
+    text. OpenAI will then format paramaters and return them within a JSON object, which will be used to trigger the
+    method with call_by_dict or call_by_dict_ctx for discord.py Bot Commands.
 
     It's possible to use both subclassed methods and discord.py Bot Commands
     so long as either are decorated with the AILibFunction and LibParam decorators.
@@ -199,42 +328,102 @@ class GPTFunctionLibrary:
     the GPTFunctionLibrary is used with the API.
 
     Attributes:
-        FunctionDict ( Dict[str, Union[Command,callable]]): A dictionary mapping command and method names to the corresponding Command or methods
+        FunctionDict ( Dict[str, Union[Command,callable]]): A dictionary mapping command and method names
+            to the corresponding Command or methods
     """
 
-    def __init__(self):
+    # The LibCommands of every decorated method in a class and its bases, gathered once when the class is defined.
+    _class_function_dict: Dict[str, LibCommand] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        function_dict = dict(cls._class_function_dict)
+        for name, method in cls.__dict__.items():
+            if hasattr(method, "libcommand"):
+                function_name = method.libcommand.function_name or method.__name__
+                logs.info(
+                    "adding %s: '%s' into %s function_dictionary",
+                    method.libcommand.comm_type,
+                    function_name,
+                    cls.__name__,
+                )
+                function_dict[function_name] = method.libcommand
+        cls._class_function_dict = function_dict
+
+    def __init__(self, max_concurrency: int = 32):
         self.FunctionDict: Dict[str, LibCommand] = {}
         self.do_expression = False
+        self.max_concurrency = max_concurrency
+        # Caps how many tool calls may run at once when they are gathered together, one per event loop.
+        self._loop_sems: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # Held while running LibCommands flagged with serialize=True, one per event loop.
+        self._loop_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._schema_cache: List[Dict[str, Any]] = None
+        self._tool_schema_cache: List[Dict[str, Any]] = None
+        self._schema_commands: List[LibCommand] = []
+        self._schema_json_cache: str = None
+        self._tool_schema_json_cache: str = None
+        self._schema_cache_version = -1
+        self._force_regex: re.Pattern = None
+        self._force_commands: List[LibCommand] = []
+        self._force_regex_version = -1
 
         self._update_function_dict()
 
-    def __new__(cls, *args: Any, **kwargs: Any) -> Any:
-        """
-        Override the __new__ method to update the FunctionDict when instantiating or subclassing.
+    @property
+    def _sem(self) -> asyncio.Semaphore:
+        """The running event loop's semaphore limiting concurrent tool calls to max_concurrency."""
+        return for_running_loop(self._loop_sems, lambda: asyncio.Semaphore(self.max_concurrency))
 
-        Returns:
-            The new instance of the class.
-        """
-        new_cls = super().__new__(cls, *args, **kwargs)
-        # new_cls._update_function_dict()
-        return new_cls
+    @property
+    def _serial_lock(self) -> asyncio.Lock:
+        """The running event loop's lock, held while running LibCommands flagged with serialize=True."""
+        return for_running_loop(self._loop_locks, asyncio.Lock)
 
     def _update_function_dict(self) -> None:
         """
         Update the FunctionDict with decorated methods from a descended class.
 
-        This method iterates over the class's methods and adds the ones with function schema to the FunctionDict.
+        The methods are gathered by __init_subclass__ when the class is defined, so this only copies them in.
         """
-        for name, method in self.__class__.__dict__.items():
-            if hasattr(method, "libcommand"):
-                function_name = method.libcommand.function_name or method.__name__
-                logs.info(
-                    "adding %s: '%s' into %s function_dictionary",
-                    method.libcommand.comm_type,
-                    function_name,
-                    self.__class__.__name__,
-                )
-                self.FunctionDict[function_name] = method.libcommand
+        self.FunctionDict.update(self._class_function_dict)
+        self.invalidate_schema_cache()
+
+    def invalidate_schema_cache(self) -> None:
+        """
+        Clear the cached output of get_schema and get_tool_schema.
+        This is done automatically when commands are added through the library, or
+        enabled/disabled, but must be called if FunctionDict is modified directly.
+        """
+        self._schema_cache = None
+        self._tool_schema_cache = None
+        self._force_regex_version = -1
+        self._schema_json_cache = None
+        self._tool_schema_json_cache = None
+
+    def _build_schema_cache(self) -> None:
+        """Rebuild the cached function and tool schema lists from every enabled LibCommand."""
+        functions_with_schema = []
+        tools_with_schema = []
+        commands_with_schema = []
+        for name, libmethod in self.FunctionDict.items():
+            schema = None
+            if libmethod.enabled:
+                schema = libmethod.function_schema
+            if schema != None:
+                if schema.get("parameters", None) != None:
+                    functions_with_schema.append(schema)
+                    tools_with_schema.append(libmethod.tool_schema)
+                    commands_with_schema.append(libmethod)
+        self._schema_cache = functions_with_schema
+        self._tool_schema_cache = tools_with_schema
+        self._schema_commands = commands_with_schema
+        self._schema_json_cache = None
+        self._tool_schema_json_cache = None
+        self._schema_cache_version = LibCommand._schema_version
+
+    def _schema_cache_stale(self) -> bool:
+        return self._schema_cache is None or self._schema_cache_version != LibCommand._schema_version
 
     def force_word_check(self, query: str):
         """
@@ -242,92 +431,144 @@ class GPTFunctionLibrary:
         force words will force OpenAI to invoke THAT particular command, as opposed to
         invoking a command automatically.
         """
-        functions_with_schema = []
-        for name, method in self.FunctionDict.items():
-            schema = None
-            comm = method
-
-            if comm:
-                if comm.check_force(query):
-                    schema = comm.function_schema
-                    new = {"type": "function", "function": schema}
-                    return [new]
+        if self._force_regex_version != LibCommand._force_words_version:
+            self._build_force_regex()
+        if self._force_regex is None:
+            return None
+        # Every command's words are searched for in one pass; if several commands match,
+        # the one added to FunctionDict first wins, as when checking them one at a time.
+        # At each position the groups are tried in FunctionDict order, so the first to match there is the earliest.
+        matched = {int(match.lastgroup[1:]) for match in self._force_regex.finditer(query)}
+        if matched:
+            return [self._force_commands[min(matched)].tool_schema]
         return None
 
+    def _build_force_regex(self) -> None:
+        """
+        Combine the force words of every command into a single pattern with one named group per command.
+        Each group is in a lookahead, so matches are zero width and one command's words can't hide another's
+        overlapping words (such as 'report' and 'weather report').
+        """
+        self._force_commands = [comm for comm in self.FunctionDict.values() if comm and comm.force_words]
+        groups = [
+            r"(?=(?P<g{}>\b(?:{})\b))".format(index, "|".join(comm._escaped_force_words))
+            for index, comm in enumerate(self._force_commands)
+        ]
+        self._force_regex = re.compile("|".join(groups), re.IGNORECASE) if groups else None
+        self._force_regex_version = LibCommand._force_words_version
+
     def get_schema(self) -> List[Dict[str, Any]]:
         """
-        Get the list of function schema dictionaries representing callable methods, coroutines, or bot Commands available to the library.
+        Get the list of function schema dictionaries representing callable methods, coroutines,
+        or bot Commands available to the library.
+        The list is cached until the library's commands change.
 
         Returns:
             A list of function schema dictionaries from each decorated method or Command
         """
-        functions_with_schema = []
-        for name, libmethod in self.FunctionDict.items():
-            schema = None
-            if libmethod.enabled:
-                schema = libmethod.function_schema
-            if schema != None:
-                if schema.get("parameters", None) != None:
-                    functions_with_schema.append(schema)
-        return functions_with_schema
+        if self._schema_cache_stale():
+            self._build_schema_cache()
+        return list(self._schema_cache)
 
     def get_tool_schema(self) -> List[Dict[str, Any]]:
         """
-        Get the list of function schema dictionaries representing callable methods, coroutines, or bot Commands available to the library.
+        Get the list of function schema dictionaries representing callable methods, coroutines,
+        or bot Commands available to the library.
+        The list is cached until the library's commands change.
 
         Returns:
             A list of function schema dictionaries from each decorated method or Command
         """
-        functions_with_schema = []
-        for name, libmethod in self.FunctionDict.items():
-            schema = None
-            if libmethod.enabled:
-                schema = libmethod.function_schema
-            if schema != None:
-                if schema.get("parameters", None) != None:
-                    new = {"type": "function", "function": schema}
-                    functions_with_schema.append(new)
-        return functions_with_schema
+        if self._schema_cache_stale():
+            self._build_schema_cache()
+        return list(self._tool_schema_cache)
+
+    def get_schema_json(self) -> str:
+        """
+        Get the output of get_schema, already encoded as a JSON array.
+        Each command's schema is only encoded once, and the array is cached until the library's commands change.
+
+        Returns:
+            A JSON string of the function schema of each decorated method or Command
+        """
+        if self._schema_cache_stale():
+            self._build_schema_cache()
+        if self._schema_json_cache is None:
+            self._schema_json_cache = "[" + ",".join(comm.schema_json for comm in self._schema_commands) + "]"
+        return self._schema_json_cache
+
+    def get_tool_schema_json(self) -> str:
+        """
+        Get the output of get_tool_schema, already encoded as a JSON array.
+        Like get_schema_json, it's built from each command's cached schema_json.
+
+        Returns:
+            A JSON string of the tool schema of each decorated method or Command
+        """
+        if self._schema_cache_stale():
+            self._build_schema_cache()
+        if self._tool_schema_json_cache is None:
+            tools = ",".join(
+                '{"type":"function","function":' + comm.schema_json + "}" for comm in self._schema_commands
+            )
+            self._tool_schema_json_cache = "[" + tools + "]"
+        return self._tool_schema_json_cache
 
     def expression_match(self, function_args: str):
         """because sometimes, the API returns an expression and not a single integer."""
         if self.do_expression:
             """In case I want to change how I want to parse expressions later."""
-            expression_detect_pattern = r'(?<=:\s)([^"]*?[+\-*/][^"]*?)(?=(?:,|\s*\}))'
-            return re.sub(expression_detect_pattern, lambda m: parse_expression(m.group()), function_args)
+            return _EXPR_RE.sub(lambda m: str(parse_expression(m.group())), function_args)
         return function_args
 
-    def parse_name_args(self, function_dict: Dict[str, Any]) -> Dict[str, Any]:
+    def parse_name_args(self, function_dict: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """parse the args within function_dict, and apply any needed corrections to the JSON."""
+        _, function_name, function_args = self._parse_call(function_dict)
+        return function_name, function_args
+
+    def _parse_call(self, function_dict: Dict[str, Any]) -> Tuple[LibCommand, str, Dict[str, Any]]:
+        """parse_name_args, but also return the LibCommand so callers don't have to look it up again."""
         function_name = function_dict.get("name")
         function_args = function_dict.get("arguments", None)
-        if function_name in self.FunctionDict:
-            if isinstance(function_args, str):
-                # Making it so it won't break on poorly formatted function arguments.
+        libmethod = self.FunctionDict.get(function_name)
+        if libmethod is None:
+            raise FunctionNotFound(function_name=function_name, arguments=function_args)
+        if function_args is None:
+            # Nothing was passed for a function that takes no arguments.
+            return libmethod, function_name, {}
+        if isinstance(function_args, str):
+            # The arguments are almost always valid JSON already, so try that before any repairs.
+            try:
+                return libmethod, function_name, loads_json(function_args)
+            except json.JSONDecodeError:
+                pass
+            # Making it so it won't break on poorly formatted function arguments.
+            if "\\n" in function_args:
                 function_args = function_args.replace("\\n", "\n")
-                quoteescapefixpattern = r"(?<=:\s\")(.*?)(?=\"(?:,|\s*\}))"
+            custom_expression_match = type(self).expression_match is not GPTFunctionLibrary.expression_match
+            if self.do_expression and not custom_expression_match:
+                # Fix the quotes and evaluate expressions with a single scan over the arguments.
+                function_args_str = _REPAIR_RE.sub(_repair_match, function_args)
+            else:
                 # In testing, I once had the API return a poorly escaped function_args attribute
                 # That could not be parsed by json.loads, so hence this regex.
-                function_args_str = re.sub(
-                    quoteescapefixpattern, lambda m: m.group().replace('"', r"\""), function_args
-                )
+                function_args_str = _QUOTE_FIX_RE.sub(lambda m: m.group().replace('"', r"\""), function_args)
 
                 # This regex is for detecting if there's an expression as a value and not a single integer.
                 # Which has happened before during testing.
-                function_args_str = self.expression_match(function_args_str)
-                logs.info("transformed json args for func %s.  result:\n%s", function_name, function_args_str)
-                try:
-                    function_args = json.loads(function_args_str, strict=False)
-                except json.JSONDecodeError as e:
-                    # Something went wrong while parsing, return where.
-                    output = (
-                        f"JSONDecodeError: {e.msg} at line {e.lineno} column {e.colno}: `{function_args_str[e.pos]}`"
-                    )
-                    raise ArgDecodeError(
-                        function_name=function_name, arguments=function_args_str, msg=f"{output}", er=e
-                    ) from e
-            return function_name, function_args
-        raise FunctionNotFound(function_name=function_name, arguments=function_args)
+                # The default expression_match does nothing without do_expression, so it's only called when overridden.
+                if custom_expression_match:
+                    function_args_str = self.expression_match(function_args_str)
+            logs.info("transformed json args for func %s.  result:\n%s", function_name, function_args_str)
+            try:
+                function_args = loads_json(function_args_str)
+            except json.JSONDecodeError as e:
+                # Something went wrong while parsing, return where.
+                output = f"JSONDecodeError: {e.msg} at line {e.lineno} column {e.colno}: `{function_args_str[e.pos]}`"
+                raise ArgDecodeError(
+                    function_name=function_name, arguments=function_args_str, msg=f"{output}", er=e
+                ) from e
+        return libmethod, function_name, function_args
 
     def convert_args(self, function_name: str, function_args: Dict[str, Any]) -> Dict[str, Any]:
         """Preform any needed conversion of the function arguments."""
@@ -356,24 +597,13 @@ class GPTFunctionLibrary:
             AttributeError: If the function name is not found or not callable.
         """
         try:
-            function_name, function_args = self.parse_name_args(function_dict)
+            libmethod, function_name, function_args = self._parse_call(function_dict)
+        except FunctionNotFound as e:
+            """Invoke a default function so something is returned..."""
+            return self.default_callback(e.function_name, e.arguments)
         except GPTLibError as e:
-            if isinstance(e, FunctionNotFound):
-                """Invoke a default function so something is returned..."""
-                return self.default_callback(e.function_name, e.arguments)
-
-            result = str(e)
-            return result
-        libmethod = self.FunctionDict.get(function_name)
-        if libmethod.comm_type == "callable":
-            function_args = libmethod.convert_args(function_args)
-            if len(function_args) > 0:
-                # for i, v in function_args.items():
-                #    print("st",i,v)
-                return libmethod.command(self, **function_args)
-            return libmethod.command(self)
-        else:
-            raise AttributeError(f"Method '{function_name}' not found or not callable.")
+            return str(e)
+        return libmethod.invoke(self, function_args)
 
     async def call_by_dict_async(self, function_dict: Dict[str, Any]):
         """
@@ -390,28 +620,16 @@ class GPTFunctionLibrary:
             AttributeError: If the function name is not found or not callable.
         """
         try:
-            function_name, function_args = self.parse_name_args(function_dict)
+            libmethod, function_name, function_args = self._parse_call(function_dict)
+        except FunctionNotFound as e:
+            """Invoke a default function so something is returned..."""
+            return self.default_callback(e.function_name, e.arguments)
         except GPTLibError as e:
-            if isinstance(e, FunctionNotFound):
-                """Invoke a default function so something is returned..."""
-                return self.default_callback(e.function_name, e.arguments)
-
-            result = str(e)
-            return result
-        libmethod = self.FunctionDict.get(function_name)
-
-        if libmethod.comm_type == "coroutine":
-            if len(function_args) > 0:
-                return await libmethod.command(self, **function_args)
-            return await libmethod.command(self)
-
-        elif libmethod.comm_type == "callable":
-            function_args = libmethod.convert_args(function_args)
-            if len(function_args) > 0:
-                return libmethod.command(self, **function_args)
-            return libmethod.command(self)
-        else:
-            raise AttributeError(f"Method '{function_name}' not found or not callable.")
+            return str(e)
+        if libmethod.serialize:
+            async with self._serial_lock:
+                return await libmethod.invoke_async(self, function_args)
+        return await libmethod.invoke_async(self, function_args)
 
     def call_by_tool(self, tool_call: Any):
         """
@@ -445,6 +663,11 @@ class GPTFunctionLibrary:
         Call a function based on the syntax from the tool object.
         works with coroutines.
 
+        Multiple tool calls can be awaited concurrently (for instance with asyncio.gather),
+        so decorated coroutines should be safe to run alongside each other.  Commands flagged
+        with serialize=True in AILibFunction are run one at a time instead, and no more than
+        max_concurrency calls are in flight at once.
+
         Args:
             tool_call (ChatCompletionMessageToolCall): Tool parameters returned by openai
 
@@ -458,7 +681,8 @@ class GPTFunctionLibrary:
 
         function_args = tool_call.function.arguments
         dictv = {"name": function_name, "arguments": function_args}
-        function_response = await self.call_by_dict_async(dictv)
+        async with self._sem:
+            function_response = await self.call_by_dict_async(dictv)
         out = {
             "tool_call_id": tool_call.id,
             "role": "tool",
@@ -476,7 +700,7 @@ def genspec(name: str, description: str, **kwargs):
     return spec
 
 
-def LibParamSpec(name: str, description: str, **kwargs):
+def LibParamSpec(name: str, description: Optional[str] = None, **kwargs):
     """
     A much more advanced variant of LibParam.  Set a function's description as well as
     additional arguments depending on the schema's type.
@@ -492,10 +716,12 @@ def LibParamSpec(name: str, description: str, **kwargs):
         The decorated function.
     """
 
+    # Built once here rather than every time the decorator is applied.
+    gen = genspec(name, description, **kwargs)
+
     def decorator(func: callable) -> callable:
         if not hasattr(func, "parameter_decorators"):
             func.parameter_decorators = {}
-        gen = genspec(name, description, **kwargs)
         func.parameter_decorators.update(gen)
         return func
 
@@ -504,7 +730,7 @@ def LibParamSpec(name: str, description: str, **kwargs):
 
 def LibParam(**kwargs: Any) -> Any:
     """
-    Decorator to add descriptions to any valid parameter inside a GPTFunctionLibary method.
+    Decorator to add descriptions to any valid parameter inside a GPTFunctionLibary method or discord.py bot command.
     AILibFunctions without this decorator will not be sent to the AI.
     Args:
         **kwargs: a function's parameters, and the description to be applied to each.
@@ -512,17 +738,26 @@ def LibParam(**kwargs: Any) -> Any:
         The decorated function.
     """
 
+    # Stored in the same dictionary form as LibParamSpec, so param_iterate never has to check.
+    specs = {name: {"description": description} for name, description in kwargs.items()}
+
     def decorator(func: callable) -> callable:
         if not hasattr(func, "parameter_decorators"):
             func.parameter_decorators = {}
-        func.parameter_decorators.update(kwargs)
+        func.parameter_decorators.update(specs)
         return func
 
     return decorator
 
 
 def AILibFunction(
-    name: str, description: str, required: List[str] = [], force_words: List[str] = [], enabled=True, strict=False
+    name: str,
+    description: str,
+    required: List[str] = [],
+    force_words: List[str] = [],
+    enabled=True,
+    strict=False,
+    serialize=False,
 ) -> Any:
     """
     Flags a callable method, Coroutine, or discord.py Command, creating a LibCommand object.
@@ -542,12 +777,14 @@ def AILibFunction(
         strict (bool): Whether to enable strict schema adherence when generating the function call.
             If set to true, the model will follow the exact schema defined in the parameters field.
             Only a subset of JSON Schema is supported when strict is true
+        serialize (bool): Whether this function is unsafe to run concurrently with itself or other
+            serialized functions.  If true, async calls to it will wait for each other.
     Returns:
         callable, Coroutine, or Command.
     """
 
     def decorator(func: Union[callable, Coroutine]):
-        mycommand = LibCommand(func, name, description, required, force_words, enabled, strict)
+        mycommand = LibCommand(func, name, description, required, force_words, enabled, strict, serialize)
         func.libcommand = mycommand
 
         return func
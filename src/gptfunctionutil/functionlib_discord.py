@@ -2,7 +2,7 @@ from __future__ import annotations
 
 
 from .logger import logs
-import inspect
+import asyncio
 import json
 import re
 from typing import Any, Coroutine, Dict, List, Optional, Union
@@ -11,38 +11,30 @@ from enum import Enum, EnumMeta
 
 from datetime import datetime
 from discord.ext.commands import Command, Context, Bot, CommandNotFound, CheckFailure
-from .functionlib import GPTFunctionLibrary, LibCommand, genspec
+
+# CommandSingleton, LibParam, LibParamSpec and genspec used to be defined here, and are still importable from here.
+from .functionlib import (  # noqa: F401
+    CommandSingleton,
+    GPTFunctionLibrary,
+    LibCommand,
+    LibParam,
+    LibParamSpec,
+    genspec,
+    _EMPTY,
+    _new_function_schema,
+    _signature,
+)
 from .convertutil import ConvertStatic
 from .errors import *
 
 
-class CommandSingleton:
-    _instance = None
-    _commands = {}
-
-    @classmethod
-    def get_instance(cls):
-        if not cls._instance:
-            cls._instance = cls()
-        return cls._instance
-
-    @staticmethod
-    def add_command(name, command):
-        CommandSingleton._commands[name] = command
-
-    @staticmethod
-    def load_command(name):
-        return CommandSingleton._commands.get(name, None)
-
-
-substitutions = {
-    "str": "string",
-    "int": "integer",
-    "bool": "boolean",
-    "float": "number",
-    "datetime": "string",
-    "Literal": "string",
-}
+def _is_registered(bot: Bot, command: Command) -> bool:
+    """Check that command is still the one registered under its name, in its parent group or in bot."""
+    while command.parent is not None:
+        if command.parent.all_commands.get(command.name) is not command:
+            return False
+        command = command.parent
+    return bot.all_commands.get(command.name) is command
 
 
 class LibCommandDisc(LibCommand):
@@ -50,6 +42,9 @@ class LibCommandDisc(LibCommand):
     that have been annotated with the LibParam and the AILibFunction decorators,
     wrapping them up with attributes that help the GPTFunctionLibary invoke them."""
 
+    # Only set for bot Commands; everything else is declared by LibCommand.
+    __slots__ = ("_resolved_command", "_defaults")
+
     def __init__(
         self,
         func: Union[Command, callable, Coroutine],
@@ -59,6 +54,7 @@ class LibCommandDisc(LibCommand):
         force_words: List[str] = [],
         enabled=True,
         strict=False,
+        serialize=False,
     ):
         """
         Description: This class represents a library command. It encapsulates a Discord bot command, along with its associated metadata and functionality.
@@ -70,6 +66,7 @@ class LibCommandDisc(LibCommand):
             required (List[str], optional): A list of required parameter names. Defaults to an empty list.
             force_words (List[str], optional): A list of force words. Defaults to an empty list.
             enabled (bool, optional): Indicates whether the command is enabled. Defaults to True.
+            serialize (bool, optional): If True, concurrent async calls will be run one at a time. Defaults to False.
         """
         self.command = func
         self.internal_name = self.function_name = name
@@ -80,23 +77,24 @@ class LibCommandDisc(LibCommand):
             self.comm_type = "command"
 
             logs.info("initalizing %s, comm type is %s", self.function_name, self.comm_type)
-            my_schema = {
-                "name": self.function_name,
-                "description": description,
-                "parameters": {"type": "object", "properties": {}, "required": []},
-                "strict": strict,
-            }
-
-            self.function_schema = my_schema
+            self.function_schema = _new_function_schema(self.function_name, description, strict)
+            self.tool_schema = {"type": "function", "function": self.function_schema}
             self.required = required
+            self._schema_json = None
+            # (bot, Command) found by the last invoke_command, see resolve_command.
+            self._resolved_command = None
+            # Every parameter's default, filled in for arguments the AI leaves out.
+            self._defaults = {param_name: param.default for param_name, param in func.clean_params.items()}
             self.param_converters = {}
+            self._param_entries = {}
             # if 'parameter_decorators' in func.extras:
             self.param_iterate()
             self.enabled = enabled
             self.force_words = force_words
             self.strict = strict
+            self.serialize = serialize
         else:
-            super().__init__(func, name, description, required, force_words, enabled, strict)
+            super().__init__(func, name, description, required, force_words, enabled, strict, serialize)
 
     def param_iterate(self):
         """
@@ -104,29 +102,63 @@ class LibCommandDisc(LibCommand):
         Every parameter that isn't 'self' or ctx must be added!
         """
         func = self.command
-        paramdict = {}
-        param_decorators = {}
+        if not hasattr(func, "parameter_decorators"):
+            # Without LibParam or LibParamSpec, no parameters are added.
+            return
         if self.comm_type == "command":
-            if hasattr(func, "parameter_decorators"):  # if 'parameter_decorators' in func.extras:
-                paramdict = func.clean_params
-                param_decorators = func.parameter_decorators  # ['parameter_decorators']
+            paramdict = func.clean_params
         else:
-            sig = inspect.signature(func)
-            if hasattr(func, "parameter_decorators"):
-                paramdict = sig.parameters
-                param_decorators = func.parameter_decorators
+            paramdict = _signature(func).parameters
+        param_decorators = func.parameter_decorators
 
-        self.function_schema.update({"parameters": {"type": "object", "properties": {}, "required": []}})
+        # Filled in place; __init__ has already set up the empty parameters skeleton.
+        parameters = self.function_schema["parameters"]
         for param_name, param in paramdict.items():
-            decs = param_decorators.get(param_name, "")
+            decs = param_decorators.get(param_name, {})
 
             param_info, converter = ConvertStatic.parameter_into_schema(param_name, param, dec=decs)
 
             if param_info is not None:
                 self.param_converters[param_name] = converter
-                self.function_schema["parameters"]["properties"][param_name] = param_info
-                if param.default == inspect.Parameter.empty or param_name in self.required:
-                    self.function_schema["parameters"]["required"].append(param_name)
+                parameters["properties"][param_name] = param_info
+                if param.default is _EMPTY or param_name in self.required:
+                    parameters["required"].append(param_name)
+
+    async def invoke_ctx(self, owner: GPTFunctionLibraryDisc, ctx: Context, function_args: Dict[str, Any]) -> Any:
+        """
+        Invoke the bot Command with ctx, or call the wrapped method or coroutine with function_args.
+
+        Args:
+            owner (GPTFunctionLibraryDisc): The library instance methods are bound to.
+            ctx (Context): The Discord command context.
+            function_args (Dict[str, Any]): The parsed function arguments.
+
+        Returns:
+            Any: The outcome of the command, or the result of the method.
+        """
+        if self.comm_type == "command":
+            return await self.invoke_command(ctx, function_args)
+        return await self.invoke_async(owner, function_args)
+
+    def resolve_command(self, bot: Bot) -> Optional[Command]:
+        """
+        Get the bot's registered Command for this LibCommand, remembering it for later calls with the same bot.
+        The remembered Command is forgotten by invalidate_command, which add_in_commands calls,
+        or when it's no longer registered with bot, such as after remove_command or unloading its cog.
+        """
+        resolved = self._resolved_command
+        if resolved is not None and resolved[0] is bot:
+            if _is_registered(bot, resolved[1]):
+                return resolved[1]
+            self.invalidate_command()
+        command = bot.get_command(self.function_name)
+        if command is not None:
+            self._resolved_command = (bot, command)
+        return command
+
+    def invalidate_command(self) -> None:
+        """Forget the Command found by resolve_command, so the next call looks it up again."""
+        self._resolved_command = None
 
     async def invoke_command(self, ctx: Context, function_args: Dict[str, Any]) -> Any:
         """
@@ -143,14 +175,12 @@ class LibCommandDisc(LibCommand):
 
         """
         bot = ctx.bot
-        command = bot.get_command(self.function_name)
+        command = self.resolve_command(bot)
         ctx.command = command
         outcome = "Done"
         function_args = self.convert_args(function_args)
-        if len(function_args) > 0:
-            for i, v in command.clean_params.items():
-                if not i in function_args:
-                    function_args[i] = v.default
+        if function_args:
+            function_args = {**self._defaults, **function_args}
             ctx.kwargs = function_args
         if ctx.command is not None:
             bot.dispatch("command", ctx)
@@ -191,41 +221,27 @@ class GPTFunctionLibraryDisc(GPTFunctionLibrary):
         FunctionDict ( Dict[str, Union[Command,callable]]): A dictionary mapping command and method names to the corresponding Command or methods
     """
 
-    def __init__(self):
-        self.FunctionDict: Dict[str, LibCommand] = {}
-        self.do_expression = False
-
-        self._update_function_dict()
-
-    def __new__(cls, *args: Any, **kwargs: Any) -> Any:
-        """
-        Override the __new__ method to update the FunctionDict when instantiating or subclassing.
-
-        Returns:
-            The new instance of the class.
-        """
-        new_cls = super().__new__(cls, *args, **kwargs)
-        # new_cls._update_function_dict()
-        return new_cls
-
     def add_in_commands(self, bot: Bot) -> None:
         """
         Update the FunctionDict with decorated discord.py bot commands.
         This has to be called somewhere before a call to the AI API if you
         want to use the commands.
         """
-        for command in bot.walk_commands():
-            if "libcommand" in command.extras:
-                libcommand = command.extras["libcommand"]
-                logs.info(
-                    "adding %s: '%s' into %s function_dictionary",
-                    libcommand.comm_type,
-                    command.qualified_name,
-                    self.__class__.__name__,
-                )
-
-                function_name = command.qualified_name
-                self.FunctionDict[function_name] = libcommand
+        found = {
+            command.qualified_name: command.extras["libcommand"]
+            for command in bot.walk_commands()
+            if "libcommand" in command.extras
+        }
+        for function_name, libcommand in found.items():
+            logs.info(
+                "adding %s: '%s' into %s function_dictionary",
+                libcommand.comm_type,
+                function_name,
+                self.__class__.__name__,
+            )
+            libcommand.invalidate_command()
+        self.FunctionDict.update(found)
+        self.invalidate_schema_cache()
 
     async def call_by_dict_ctx(self, ctx: Context, function_dict: Dict[str, Any]) -> Coroutine:
         """
@@ -244,30 +260,56 @@ class GPTFunctionLibraryDisc(GPTFunctionLibrary):
             AttributeError: If the function name is not found or not callable.
         """
         try:
-            function_name, function_args = self.parse_name_args(function_dict)
+            libmethod, function_name, function_args = self._parse_call(function_dict)
+        except FunctionNotFound as e:
+            return self.default_callback(e.function_name, e.arguments)
         except GPTLibError as e:
-            if isinstance(e, FunctionNotFound):
-                return self.default_callback(e.function_name, e.arguments)
-
-            result = str(e)
-            return result
+            return str(e)
 
-        libmethod = self.FunctionDict.get(function_name)
         logs.info("invoking %s `%s` with args %s", libmethod.comm_type, function_name, function_args)
-        if libmethod.comm_type == "command":
-            return await libmethod.invoke_command(ctx, function_args)
+        if libmethod.serialize:
+            async with self._serial_lock:
+                return await libmethod.invoke_ctx(self, ctx, function_args)
+        return await libmethod.invoke_ctx(self, ctx, function_args)
 
-        else:
-            if libmethod.comm_type == "coroutine":
-                if len(function_args) > 0:
-                    return await libmethod.command(self, **function_args)
-                return await libmethod.command(self)
-            elif libmethod.comm_type == "callable":
-                if len(function_args) > 0:
-                    return libmethod.command(self, **function_args)
-                return libmethod.command(self)
+    async def call_many_by_dict_ctx(self, ctx: Context, function_dicts: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Run call_by_dict_ctx for each dictionary, calling the methods and coroutines concurrently,
+        at most max_concurrency at a time.
+        Bot Commands all share ctx, so they are invoked one at a time, in order, alongside the other calls.
+        Serialized functions still wait for each other.
+
+        Args:
+            ctx (commands.Context): context object.
+            function_dicts (List[Dict[str, Any]]): The dictionaries containing each function name and arguments.
+
+        Returns:
+            The result of each call, in the same order as function_dicts.
+            If a call raised an exception, the exception is returned in its place.
+        """
+        results: List[Any] = [None] * len(function_dicts)
+        commands, others = [], []
+        for index, function_dict in enumerate(function_dicts):
+            libmethod = self.FunctionDict.get(function_dict.get("name"))
+            if libmethod is not None and libmethod.comm_type == "command":
+                commands.append(index)
             else:
-                raise AttributeError(f"Method '{function_name}' not found or not callable.")
+                others.append(index)
+
+        async def call(index: int) -> None:
+            async with self._sem:
+                try:
+                    results[index] = await self.call_by_dict_ctx(ctx, function_dicts[index])
+                except Exception as e:
+                    results[index] = e
+
+        async def call_commands() -> None:
+            # invoke_command sets ctx.command and ctx.kwargs, so overlapping commands would see each other's.
+            for index in commands:
+                await call(index)
+
+        await asyncio.gather(call_commands(), *(call(index) for index in others))
+        return results
 
     async def call_by_tool_ctx(self, ctx: Context, tool_call: Any):
         """
@@ -289,7 +331,8 @@ class GPTFunctionLibraryDisc(GPTFunctionLibrary):
 
         function_args = tool_call.function.arguments
         dictv = {"name": function_name, "arguments": function_args}
-        function_response = await self.call_by_dict_ctx(ctx, dictv)
+        async with self._sem:
+            function_response = await self.call_by_dict_ctx(ctx, dictv)
         out = {
             "tool_call_id": tool_call.id,
             "role": "tool",
@@ -299,53 +342,14 @@ class GPTFunctionLibraryDisc(GPTFunctionLibrary):
         return out
 
 
-def LibParamSpec(name: str, description: Optional[str] = None, **kwargs):
-    """
-    A much more advanced variant of LibParam.  Set a function's description as well as
-    additional arguments depending on the schema's type.
-    For instance, you can restrict a string's length with "minLength" and  "maxLength",
-    set the minimum and maximum of a number with 'minimum' and 'maximum', and more.
-
-    AILibFunctions without this decorator will not be sent to the AI.
-    Args:
-        name: name of the parameter to apply description to.
-        description: description to be applied to the parameter.
-        **kwargs: a function's parameters, and the description to be applied to each.
-    Returns:
-        The decorated function.
-    """
-
-    def decorator(func: callable) -> callable:
-        if not hasattr(func, "parameter_decorators"):
-            func.parameter_decorators = {}
-        gen = genspec(name, description, **kwargs)
-        func.parameter_decorators.update(gen)
-        return func
-
-    return decorator
-
-
-def LibParam(**kwargs: Any) -> Any:
-    """
-    Decorator to add descriptions to any valid parameter inside a GPTFunctionLibary method or discord.py bot command.
-    AILibFunctions without this decorator will not be sent to the AI.
-    Args:
-        **kwargs: a function's parameters, and the description to be applied to each.
-    Returns:
-        The decorated function.
-    """
-
-    def decorator(func: callable) -> callable:
-        if not hasattr(func, "parameter_decorators"):
-            func.parameter_decorators = {}
-        func.parameter_decorators.update(kwargs)
-        return func
-
-    return decorator
-
-
 def AILibFunction(
-    name: str, description: str, required: List[str] = [], force_words: List[str] = [], enabled=True, strict=False
+    name: str,
+    description: str,
+    required: List[str] = [],
+    force_words: List[str] = [],
+    enabled=True,
+    strict=False,
+    serialize=False,
 ) -> Any:
     """
     Flags a callable method, Coroutine, or discord.py Command, creating a LibCommand object.
@@ -362,6 +366,8 @@ def AILibFunction(
         required:List[str]: list of parameters you want the AI to always use reguardless of if they have defaults.
         force_words:List[str]: list of words that will be used to force this command to be triggered.
         enabled (bool): Whether or not this function is enabled by default.
+        serialize (bool): Whether this function is unsafe to run concurrently with itself or other
+            serialized functions.  If true, async calls to it will wait for each other.
     Returns:
         callable, Coroutine, or Command.
     """
@@ -369,11 +375,11 @@ def AILibFunction(
     def decorator(func: Union[Command, callable, Coroutine]):
         if isinstance(func, Command):
             # Added to the extras dictionary in the Command
-            mycommand = LibCommandDisc(func, name, description, required, force_words, enabled, strict)
+            mycommand = LibCommandDisc(func, name, description, required, force_words, enabled, strict, serialize)
             func.extras["libcommand"] = mycommand
             return func
         else:
-            mycommand = LibCommandDisc(func, name, description, required, force_words, enabled, strict)
+            mycommand = LibCommandDisc(func, name, description, required, force_words, enabled, strict, serialize)
             func.libcommand = mycommand
 
             return func
@@ -6,14 +6,23 @@ a simple logger.
 logs = logging.getLogger("gptfunctionutil")
 logs.setLevel(logging.ERROR)
 
-# Create a console handler and set the level to INFO
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logs.level)
+# Nothing is printed unless the application configures logging, or calls configure.
+logs.addHandler(logging.NullHandler())
 
-# Create a formatter and add it to the console handler
 dt_fmt = "%Y-%m-%d %H:%M:%S"
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", dt_fmt)
-console_handler.setFormatter(formatter)
 
-# Add the console handler to the logs
-logs.addHandler(console_handler)
+
+def configure(level: int = logging.INFO) -> logging.Handler:
+    """
+    Print this library's logs to the console, at level or above.
+
+    Returns:
+        logging.Handler: The console handler that was added, so it can be removed again.
+    """
+    logs.setLevel(level)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(level)
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", dt_fmt)
+    console_handler.setFormatter(formatter)
+    logs.addHandler(console_handler)
+    return console_handler
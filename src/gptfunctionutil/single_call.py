@@ -1,9 +1,149 @@
-from typing import Any, Dict, List, Optional, Tuple, Union
+import asyncio
+import concurrent.futures
+import functools
+import hashlib
+import importlib.util
+import json
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterator, List, MutableMapping, Optional, Tuple, Union
 
 from .functionlib import GPTFunctionLibrary
 from .errors import *
+from .util import for_running_loop
 import openai
 
+try:
+    from openai.types.chat import ChatCompletionMessageFunctionToolCall as _ToolCall
+except ImportError:
+    # Older openai releases only have the one tool call type.
+    from openai.types.chat import ChatCompletionMessageToolCall as _ToolCall
+
+# Clients shared between SingleCall objects, keyed by api key and base url (and pool size for async clients).
+# Reusing them keeps connection pools and TLS sessions alive across calls.
+# A SingleCall's timeout is applied to a with_options copy, so sharing a client between callers is safe.
+_CLIENT_CACHE: Dict[Tuple[Optional[str], Optional[str]], openai.Client] = {}
+# Async clients are also kept per event loop, and forgotten when their loop is garbage collected.
+_AsyncClients = Dict[Tuple[Optional[str], Optional[str], int], openai.AsyncClient]
+_ASYNC_CLIENT_CACHE: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncClients]" = weakref.WeakKeyDictionary()
+# Held while creating a client, so threads asking for the same one at once don't each build it.
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_shared_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> openai.Client:
+    """
+    Get a process wide openai.Client for api_key and base_url, creating it on first use.
+
+    Parameters
+    ----------
+    api_key : Optional[str], optional
+        The api key to use.  If None, the OPENAI_API_KEY environment variable is used.
+    base_url : Optional[str], optional
+        The base url of the API.  If None, the OPENAI_BASE_URL environment variable or OpenAI's url is used.
+
+    Returns
+    -------
+    openai.Client
+        The shared client for api_key and base_url.
+    """
+    key = (api_key, base_url)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        with _CLIENT_LOCK:
+            client = _CLIENT_CACHE.get(key)
+            if client is None:
+                client = _CLIENT_CACHE[key] = openai.Client(api_key=api_key, base_url=base_url)
+    return client
+
+
+def get_shared_async_client(
+    api_key: Optional[str] = None, max_connections: int = 1024, base_url: Optional[str] = None
+) -> openai.AsyncClient:
+    """
+    Get an openai.AsyncClient for api_key and base_url shared within the running event loop, creating it on first use.
+
+    The client's connections belong to the loop they were opened in, so each event loop gets its own client,
+    which is dropped along with the loop.  Called outside of a running loop, a new client is returned every time.
+
+    The client is backed by a single httpx.AsyncClient with a large connection pool, so
+    concurrent calls can reuse kept-alive connections instead of opening new ones.
+    HTTP/2 is used when the h2 package is installed.
+
+    Parameters
+    ----------
+    api_key : Optional[str], optional
+        The api key to use.  If None, the OPENAI_API_KEY environment variable is used.
+    max_connections : int, optional
+        The maximum number of concurrent connections in the pool.  Defaults to 1024.
+    base_url : Optional[str], optional
+        The base url of the API.  If None, the OPENAI_BASE_URL environment variable or OpenAI's url is used.
+
+    Returns
+    -------
+    openai.AsyncClient
+        The shared client for api_key, base_url and max_connections in the running loop.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _new_async_client(api_key, max_connections, base_url)
+    key = (api_key, base_url, max_connections)
+    client = _ASYNC_CLIENT_CACHE.get(loop, {}).get(key)
+    if client is not None:
+        return client
+    with _CLIENT_LOCK:
+        clients = _ASYNC_CLIENT_CACHE.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = _new_async_client(api_key, max_connections, base_url)
+    return client
+
+
+def _new_async_client(api_key: Optional[str], max_connections: int, base_url: Optional[str]) -> openai.AsyncClient:
+    """Create the client for get_shared_async_client."""
+    try:
+        import httpx
+    except ImportError:
+        httpx = None
+    if httpx is None or not issubclass(openai.DefaultAsyncHttpxClient, httpx.AsyncClient):
+        # openai releases built on another http library; use the client's own default pool.
+        return openai.AsyncClient(api_key=api_key, base_url=base_url)
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max(1, max_connections // 4))
+    # The OpenAI client already retries failed requests, so the transport doesn't need to.
+    http2 = importlib.util.find_spec("h2") is not None
+    transport = httpx.AsyncHTTPTransport(retries=0, http2=http2, limits=limits)
+    # DefaultAsyncHttpxClient keeps openai's other settings, such as following redirects.
+    # The pool size is set on the transport, since the client's own limits only apply to a transport it creates.
+    http_client = openai.DefaultAsyncHttpxClient(transport=transport)
+    return openai.AsyncClient(api_key=api_key, base_url=base_url, http_client=http_client)
+
+
+async def aclose_shared_clients() -> None:
+    """
+    Close and forget every client created by get_shared_client, and the clients
+    get_shared_async_client created for the running event loop.
+    """
+    clients = _ASYNC_CLIENT_CACHE.pop(asyncio.get_running_loop(), {})
+    while clients:
+        _, client = clients.popitem()
+        await client.close()
+    while _CLIENT_CACHE:
+        _, client = _CLIENT_CACHE.popitem()
+        client.close()
+
+
+async def _cancel_tasks(tasks: List[asyncio.Future]) -> None:
+    """Cancel whichever of tasks are unfinished, and wait for all of them, so none are left running or unretrieved."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@functools.lru_cache(maxsize=128)
+def _tool_choice(name: str) -> Dict[str, Any]:
+    """The tool_choice forcing the function called name.  Shared between calls, so it must not be modified."""
+    return {"type": "function", "function": {"name": name}}
+
 
 class SingleCall_Core:
     """
@@ -15,14 +155,21 @@ class SingleCall_Core:
     ----------
     mylib : GPTFunctionLibrary
         An instance of GPTFunctionLibrary containing utility functions.
-    client : Union[openai.Client, openai.AsyncClient]
+    client : Union[openai.Client, openai.AsyncClient, None], optional
         The OpenAI client, which could be either synchronous or asynchronous.
+        If None, a shared client from get_shared_client/get_shared_async_client is used.
     model : str, optional
         The model to use for the API call. Defaults to "gpt-4o-mini".
     systemprompt : str, optional
         The system prompt to use in the API call. Defaults to "You are a helpful assistant.".
     timeout : Optional[float], optional
-        The timeout in seconds for the API call. Defaults to None.
+        The timeout in seconds for the API call, set once on the client with client.with_options.
+        Defaults to None, which keeps the client's own timeout.
+    cache : Optional[MutableMapping], optional
+        If given, the tool calls the API returns are stored here, and an identical request
+        (same model, system prompt, user prompt, tool choice and tools) reuses them instead of calling the API again.
+        The tools themselves are still run every time.  Any mapping works, such as a dict or a cachetools.TTLCache.
+        Defaults to None, which disables caching.
 
     Attributes
     ----------
@@ -37,28 +184,75 @@ class SingleCall_Core:
     client : openai.Client, None
         The synchronous client, if provided.
     timeout : Optional[float]
-        The timeout for the API call.
+        The timeout for the API call.  Reassigning it doesn't change the client's timeout,
+        use client.with_options for that.
+    cache : Optional[MutableMapping]
+        The cache of tool calls returned by the API, if enabled.
 
     """
 
+    _is_async = False
+
     def __init__(
         self,
         mylib: GPTFunctionLibrary,
-        client: Union[openai.Client, openai.AsyncClient],
+        client: Optional[Union[openai.Client, openai.AsyncClient]] = None,
         model: str = "gpt-4o-mini",
         systemprompt: str = "You are a helpful assistant.",
         timeout: Optional[float] = None,
+        cache: Optional[MutableMapping] = None,
     ):
         self.model = model
         self.mylib = mylib
         self.systemprompt = systemprompt
+        # The parts of the request that are the same for every call, copied by format_kwargs.
+        # Rebuilt if model or systemprompt are reassigned.
+        self._template: Dict[str, Any] = {}
+        self._template_key: Tuple[Any, ...] = ()
         self.a_client = self.client = None
         self.timeout = timeout
+        self.cache = cache
+        if client is None:
+            client = get_shared_async_client() if self._is_async else get_shared_client()
+        if timeout is not None:
+            # A copy sharing the same connection pool, so a shared client's own timeout is left alone.
+            client = client.with_options(timeout=timeout)
         if isinstance(client, openai.AsyncClient):
             self.a_client = client
         else:
             self.client = client
 
+    @classmethod
+    def from_client(
+        cls, mylib: GPTFunctionLibrary, client: Union[openai.Client, openai.AsyncClient], **kwargs: Any
+    ) -> "SingleCall_Core":
+        """
+        Create an instance with client, checking up front that it's the kind of client this class needs.
+
+        Parameters
+        ----------
+        mylib : GPTFunctionLibrary
+            An instance of GPTFunctionLibrary containing utility functions.
+        client : Union[openai.Client, openai.AsyncClient]
+            An openai.Client for SingleCall, or an openai.AsyncClient for SingleCallAsync.
+        **kwargs
+            Any other parameters of the class.
+
+        Returns
+        -------
+        SingleCall_Core
+            The new instance.
+
+        Raises
+        ------
+        WrongClient
+            Raised if client is the wrong kind of client for this class.
+        """
+        expected = openai.AsyncClient if cls._is_async else openai.Client
+        if not isinstance(client, expected):
+            raise WrongClient(f"{cls.__name__} requires an OpenAI.{expected.__name__} object.")
+        return cls(mylib, client, **kwargs)
+
     def format_kwargs(self, user_prompt, to_call: Union[str, Dict[str, Dict[str, str]]]) -> Dict[str, Any]:
         """
         Formats the arguments for API call from provided user prompt and tool choice.
@@ -76,27 +270,37 @@ class SingleCall_Core:
             A dictionary of the formatted kwargs to be used in an API call.
         """
         callthis = to_call
-        if callthis not in ["auto", "none"]:
-            callthis = {"type": "function", "function": {"name": to_call}}
-        kwargs = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": self.systemprompt,
-                },
-                {
-                    "role": "user",
-                    "content": user_prompt,
-                },
-            ],
-            "tools": self.mylib.get_tool_schema(),
-            "tool_choice": callthis,
-        }
-        if self.timeout:
-            kwargs["timeout"] = self.timeout
+        if isinstance(to_call, str) and to_call not in ("auto", "none"):
+            callthis = _tool_choice(to_call)
+        template_key = (self.model, self.systemprompt)
+        if template_key != self._template_key:
+            self._template = {"model": self.model, "messages": ({"role": "system", "content": self.systemprompt},)}
+            self._template_key = template_key
+        kwargs = self._template.copy()
+        kwargs["messages"] = [*kwargs["messages"], {"role": "user", "content": user_prompt}]
+        kwargs["tools"] = self.mylib.get_tool_schema()
+        kwargs["tool_choice"] = callthis
         return kwargs
 
+    def cache_key(self, user_prompt: str, to_call: Union[str, Dict[str, Dict[str, str]]]) -> str:
+        """
+        Get the key a request is stored under in cache.
+
+        Parameters
+        ----------
+        user_prompt : str
+            The user's input prompt.
+        to_call : Union[str, Dict[str, Dict[str, str]]]
+            Tool choice either as a string identifier or a dict defining tool and parameters.
+
+        Returns
+        -------
+        str
+            A digest of everything sent to the API that can change its response.
+        """
+        request = [self.model, self.systemprompt, user_prompt, to_call, self.mylib.get_tool_schema_json()]
+        return hashlib.blake2b(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
 
 class SingleCall(SingleCall_Core):
     """
@@ -114,6 +318,10 @@ class SingleCall(SingleCall_Core):
     call_single(user_prompt: str, to_call: str = "auto") -> List[Tuple[str, Any]]:
         Makes a single synchronous call to the OpenAI API with the provided user prompt and optional tool selection,
         returning a list of tuples containing tool names and their outputs.
+    call_single_iter(user_prompt: str, to_call: str = "auto") -> Iterator[Tuple[str, Any]]:
+        Like call_single, but yields each tool name and output as it is produced.
+    call_many(prompts: List[str], to_call: str = "auto", max_concurrency: int = 8) -> List[List[Tuple[str, Any]]]:
+        Runs call_single for every prompt in a pool of threads, returning the results in the same order as prompts.
     """
 
     def call_single(self, user_prompt: str, to_call: str = "auto") -> List[Tuple[str, Any]]:
@@ -139,21 +347,105 @@ class SingleCall(SingleCall_Core):
         NoToolParams
             Raised if the API response does not contain any valid tool calls.
         """
-        kwargs = self.format_kwargs(user_prompt, to_call)
+        return list(self.call_single_iter(user_prompt, to_call))
+
+    def call_single_iter(self, user_prompt: str, to_call: str = "auto") -> Iterator[Tuple[str, Any]]:
+        """
+        Like call_single, but yield each tool's name and output as soon as that tool has run,
+        so the caller can use one output while the next tool is still to be called.
+
+        The API call is made, and any exception raised, when iteration starts.
+
+        Parameters
+        ----------
+        user_prompt : str
+            The user's input prompt.
+        to_call : str, optional
+            The tool to call as part of the API request, by default "auto", which automatically selects the tool.
+
+        Yields
+        ------
+        Tuple[str, Any]
+            The name and output of each tool, in the order the API returned them.
+
+        Raises
+        ------
+        WrongClient
+            Raised if an OpenAI.Client object is not initialized.
+        NoToolParams
+            Raised if the API response does not contain any valid tool calls.
+        """
+        call_by_tool = self.mylib.call_by_tool
+        for tool in self._get_tool_calls(user_prompt, to_call):
+            yield tool.function.name, call_by_tool(tool)
+
+    def _get_tool_calls(self, user_prompt: str, to_call: str) -> List[Any]:
+        """
+        Get the tool calls for user_prompt, from the cache or the API, without running them.
+
+        Raises
+        ------
+        WrongClient
+            Raised if an OpenAI.Client object is not initialized.
+        NoToolParams
+            Raised if the API response does not contain any valid tool calls.
+        """
         if self.client is None:
             raise WrongClient("SingleCall requires an OpenAI.Client object. Please correct the initalization.")
-        completion = self.client.chat.completions.create(**kwargs)
-        message = completion.choices[0].message
-        to_return = []
-        if message.tool_calls:
-            for tool in message.tool_calls:
+        key = tool_calls = None
+        if self.cache is not None:
+            key = self.cache_key(user_prompt, to_call)
+            tool_calls = self.cache.get(key)
+        if tool_calls is None:
+            kwargs = self.format_kwargs(user_prompt, to_call)
+            completion = self.client.chat.completions.create(**kwargs)
+            tool_calls = completion.choices[0].message.tool_calls
+            if key is not None and tool_calls:
+                self.cache[key] = tool_calls
+        if not tool_calls:
+            raise NoToolParams("The API did not return any valid tool calls in the response.")
+        return tool_calls
 
-                function = tool.function
-                output = self.mylib.call_by_tool(tool)
-                result_tuple = (function.name, output)
-                to_return.append(result_tuple)
-            return to_return
-        raise NoToolParams("The API did not return any valid tool calls in the response.")
+    def call_many(
+        self, prompts: List[str], to_call: str = "auto", max_concurrency: int = 8
+    ) -> List[List[Tuple[str, Any]]]:
+        """
+        Run call_single for every prompt, with at most max_concurrency requests in flight.
+
+        The requests share this object's client, so they go out over its pooled connections
+        instead of waiting on each other one at a time.  The tools are run afterwards, in order.
+
+        Parameters
+        ----------
+        prompts : List[str]
+            The user prompts to send, one API call each.
+        to_call : str, optional
+            The tool to call as part of each API request, by default "auto", which automatically selects the tool.
+        max_concurrency : int, optional
+            The number of threads making requests at once.  Defaults to 8.
+
+        Returns
+        -------
+        List[List[Tuple[str, Any]]]
+            The output of call_single for each prompt, in the same order as prompts.
+
+        Raises
+        ------
+        WrongClient
+            Raised if an OpenAI.Client object is not initialized.
+        NoToolParams
+            Raised if any API response does not contain any valid tool calls.
+        """
+        if self.client is None:
+            raise WrongClient("SingleCall requires an OpenAI.Client object. Please correct the initalization.")
+        if len(prompts) <= 1:
+            return [self.call_single(prompt, to_call) for prompt in prompts]
+        # Only the API requests run in the pool.  The tools are then run here, one at a time, exactly as
+        # call_single runs them, so functions that aren't safe to run concurrently never overlap.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_concurrency, len(prompts))) as pool:
+            responses = list(pool.map(lambda prompt: self._get_tool_calls(prompt, to_call), prompts))
+        call_by_tool = self.mylib.call_by_tool
+        return [[(tool.function.name, call_by_tool(tool)) for tool in tool_calls] for tool_calls in responses]
 
 
 class SingleCallAsync(SingleCall_Core):
@@ -166,15 +458,91 @@ class SingleCallAsync(SingleCall_Core):
     Parameters
     ----------
     See SingleCall_Core for inherited parameters.
+    The parameters after timeout, including cache, are keyword only.
+    max_connections : int, optional
+        Size of the connection pool of the shared client used when client is None. Defaults to 1024.
+    max_concurrency : int, optional
+        Maximum number of API calls call_single_batch keeps in flight at once. Defaults to 32.
+    cache : Optional[MutableMapping], optional
+        See SingleCall_Core.
+    http_client : Optional[httpx.AsyncClient], optional
+        If client is None, a new openai.AsyncClient is created with this http client instead of using the shared one.
+        See with_aiohttp.
 
     Methods
     -------
     call_single(user_prompt: str, to_call: str = "auto") -> List[Tuple[str, Any]]:
         Makes a single asynchronous call to the OpenAI API with the provided user prompt and optional tool selection,
         returning a list of tuples containing tool names and their outputs.
+    call_single_iter(user_prompt: str, to_call: str = "auto") -> AsyncIterator[Tuple[str, Any]]:
+        Like call_single, but yields each tool name and output as soon as that tool finishes.
+    call_single_batch(prompts: List[str], to_call: str = "auto") -> List[List[Tuple[str, Any]]]:
+        Runs call_single for every prompt concurrently, returning the results in the same order as prompts.
     """
 
-    async def call_single(self, user_prompt: str, to_call: str = "auto") -> List[Tuple[str, Any]]:
+    _is_async = True
+
+    def __init__(
+        self,
+        mylib: GPTFunctionLibrary,
+        client: Optional[openai.AsyncClient] = None,
+        model: str = "gpt-4o-mini",
+        systemprompt: str = "You are a helpful assistant.",
+        timeout: Optional[float] = None,
+        *,
+        max_connections: int = 1024,
+        max_concurrency: int = 32,
+        cache: Optional[MutableMapping] = None,
+        http_client: Optional[Any] = None,
+    ):
+        if client is None:
+            if http_client is not None:
+                client = openai.AsyncClient(http_client=http_client)
+            else:
+                client = get_shared_async_client(max_connections=max_connections)
+        super().__init__(mylib, client, model, systemprompt, timeout, cache=cache)
+        self.max_concurrency = max_concurrency
+        # Separate from the library's own semaphores, which the tool calls inside each request acquire.
+        self._loop_sems: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def _sem(self) -> asyncio.Semaphore:
+        """The running event loop's semaphore limiting call_single_batch to max_concurrency requests."""
+        return for_running_loop(self._loop_sems, lambda: asyncio.Semaphore(self.max_concurrency))
+
+    @classmethod
+    def with_aiohttp(cls, mylib: GPTFunctionLibrary, api_key: Optional[str] = None, **kwargs: Any) -> "SingleCallAsync":
+        """
+        Create a SingleCallAsync whose client sends requests through aiohttp instead of httpx's own transport,
+        which holds up better with many requests in flight.
+
+        Parameters
+        ----------
+        mylib : GPTFunctionLibrary
+            An instance of GPTFunctionLibrary containing utility functions.
+        api_key : Optional[str], optional
+            The api key to use.  If None, the OPENAI_API_KEY environment variable is used.
+        **kwargs
+            Any other SingleCallAsync parameters, except client and http_client.
+
+        Returns
+        -------
+        SingleCallAsync
+            The new SingleCallAsync.
+
+        Raises
+        ------
+        ImportError
+            Raised if the installed openai package has no aiohttp support.
+            Install it with pip install gptfunctionutil[aiohttp].
+        """
+        aiohttp_client = getattr(openai, "DefaultAioHttpClient", None)
+        if aiohttp_client is None:
+            raise ImportError("with_aiohttp needs a newer openai package, install gptfunctionutil[aiohttp].")
+        client = openai.AsyncClient(api_key=api_key, http_client=aiohttp_client())
+        return cls(mylib, client, **kwargs)
+
+    async def call_single(self, user_prompt: str, to_call: str = "auto", stream: bool = False) -> List[Tuple[str, Any]]:
         """
         Perform a single asynchronous API call to the OpenAI API with a user prompt and an optional tool selection.
 
@@ -184,6 +552,9 @@ class SingleCallAsync(SingleCall_Core):
             The user's input prompt.
         to_call : str, optional
             The tool to call as part of the API request, by default "auto", which automatically selects the tool.
+        stream : bool, optional
+            If True, the response is streamed, and each tool is started as soon as the API has finished sending its
+            call instead of waiting for the whole response.  Defaults to False.
 
         Returns
         -------
@@ -197,19 +568,159 @@ class SingleCallAsync(SingleCall_Core):
         NoToolParams
             Raised if the API response does not contain any valid tool calls.
         """
-        kwargs = self.format_kwargs(user_prompt, to_call)
+        tool_calls, tasks = await self._start_tool_calls(user_prompt, to_call, stream)
+        # The tools run concurrently, limited by the library's max_concurrency.
+        try:
+            outputs = await asyncio.gather(*tasks)
+        except BaseException:
+            await _cancel_tasks(tasks)
+            raise
+        return [(tool.function.name, output) for tool, output in zip(tool_calls, outputs)]
+
+    async def call_single_iter(
+        self, user_prompt: str, to_call: str = "auto", stream: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Like call_single, but yield each tool's name and output as soon as that tool finishes,
+        so the caller can use one output while the other tools are still running.
+
+        The API call is made, and any exception raised, when iteration starts.
+        If iteration is stopped early, the tools that haven't finished are cancelled.
+
+        Parameters
+        ----------
+        user_prompt : str
+            The user's input prompt.
+        to_call : str, optional
+            The tool to call as part of the API request, by default "auto", which automatically selects the tool.
+        stream : bool, optional
+            If True, the response is streamed, as in call_single.  Defaults to False.
+
+        Yields
+        ------
+        Tuple[str, Any]
+            The name and output of each tool, in the order the tools finish.
+
+        Raises
+        ------
+        WrongClient
+            Raised if an OpenAI.AsyncClient object is not initialized.
+        NoToolParams
+            Raised if the API response does not contain any valid tool calls.
+        """
+        tool_calls, tasks = await self._start_tool_calls(user_prompt, to_call, stream)
+        names = {task: tool.function.name for tool, task in zip(tool_calls, tasks)}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.index):
+                    yield names[task], task.result()
+        finally:
+            await _cancel_tasks(tasks)
+
+    async def _start_tool_calls(
+        self, user_prompt: str, to_call: str, stream: bool
+    ) -> Tuple[List[Any], List[asyncio.Future]]:
+        """
+        Get the tool calls for user_prompt, from the cache or the API, and start running each of them.
+
+        Returns
+        -------
+        Tuple[List[Any], List[asyncio.Future]]
+            The tool calls, and the task running each of them.
+        """
         if self.a_client is None:
             raise WrongClient(
                 "SingleCallAsync requires an OpenAI.AsyncClient object.  Please correct the initalization."
             )
-        completion = await self.a_client.chat.completions.create(**kwargs)
-        message = completion.choices[0].message
-        to_return = []
-        if message.tool_calls:
-            for tool in message.tool_calls:
-                function = tool.function
-                output = await self.mylib.call_by_tool_async(tool)
-                result_tuple = (function.name, output)
-                to_return.append(result_tuple)
-            return to_return
-        raise NoToolParams("The API did not return any valid tool calls in the response.")
+        key = tool_calls = None
+        if self.cache is not None:
+            key = self.cache_key(user_prompt, to_call)
+            tool_calls = self.cache.get(key)
+        tasks = None
+        if tool_calls is None:
+            kwargs = self.format_kwargs(user_prompt, to_call)
+            if stream:
+                tool_calls, tasks = await self._stream_tool_calls(kwargs)
+            else:
+                completion = await self.a_client.chat.completions.create(**kwargs)
+                tool_calls = completion.choices[0].message.tool_calls
+            if key is not None and tool_calls:
+                self.cache[key] = tool_calls
+        if not tool_calls:
+            raise NoToolParams("The API did not return any valid tool calls in the response.")
+        if tasks is None:
+            tasks = [asyncio.ensure_future(self.mylib.call_by_tool_async(tool)) for tool in tool_calls]
+        return tool_calls, tasks
+
+    async def _stream_tool_calls(self, kwargs: Dict[str, Any]) -> Tuple[List[Any], List[asyncio.Future]]:
+        """
+        Stream a completion, starting call_by_tool_async for each tool call as soon as it has been received.
+
+        Returns
+        -------
+        Tuple[List[Any], List[asyncio.Future]]
+            The tool calls in the response, and the task running each of them.
+        """
+        completion = await self.a_client.chat.completions.create(stream=True, **kwargs)
+        # [id, name, arguments] of each tool call still being received, by index.
+        parts: Dict[int, List[str]] = {}
+        tool_calls, tasks = [], []
+
+        def start(index: int) -> None:
+            tool_id, name, arguments = parts.pop(index)
+            tool = _ToolCall(id=tool_id, type="function", function={"name": name, "arguments": arguments})
+            tool_calls.append(tool)
+            tasks.append(asyncio.ensure_future(self.mylib.call_by_tool_async(tool)))
+
+        try:
+            async for chunk in completion:
+                if not chunk.choices:
+                    continue
+                for delta in chunk.choices[0].delta.tool_calls or ():
+                    if delta.index not in parts:
+                        # Tool calls are streamed one after another, so the earlier ones are complete.
+                        for index in sorted(parts):
+                            start(index)
+                        parts[delta.index] = [delta.id, "", ""]
+                    part = parts[delta.index]
+                    if delta.function is not None:
+                        part[1] += delta.function.name or ""
+                        part[2] += delta.function.arguments or ""
+            for index in sorted(parts):
+                start(index)
+        except BaseException:
+            await _cancel_tasks(tasks)
+            raise
+        return tool_calls, tasks
+
+    async def call_single_batch(self, prompts: List[str], to_call: str = "auto") -> List[List[Tuple[str, Any]]]:
+        """
+        Run call_single for every prompt concurrently, with at most max_concurrency requests in flight.
+
+        Parameters
+        ----------
+        prompts : List[str]
+            The user prompts to send, one API call each.
+        to_call : str, optional
+            The tool to call as part of each API request, by default "auto", which automatically selects the tool.
+
+        Returns
+        -------
+        List[List[Tuple[str, Any]]]
+            The output of call_single for each prompt, in the same order as prompts.
+
+        Raises
+        ------
+        WrongClient
+            Raised if an OpenAI.AsyncClient object is not initialized.
+        NoToolParams
+            Raised if any API response does not contain any valid tool calls.
+        """
+
+        async def call_limited(user_prompt: str) -> List[Tuple[str, Any]]:
+            async with self._sem:
+                return await self.call_single(user_prompt, to_call)
+
+        return list(await asyncio.gather(*(call_limited(prompt) for prompt in prompts)))
@@ -1,17 +1,112 @@
-import sympy as sp
+import ast
+import asyncio
+import functools
+import json
+import operator
+import weakref
+from typing import Any, Callable, TypeVar
 
+T = TypeVar("T")
 
-def parse_expression(expression_str: str) -> sp.Expr:
+try:
+    # orjson is considerably faster at decoding, install it with pip install gptfunctionutil[fast]
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def for_running_loop(cache: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]", factory: Callable[[], T]) -> T:
+    """
+    Get the value in cache for the running event loop, creating it with factory on first use.
+
+    asyncio primitives like Semaphore and Lock bind to the first loop that waits on them,
+    so an object that can be used from more than one loop needs one of each per loop.
+    Entries are dropped along with their loop.
+    """
+    loop = asyncio.get_running_loop()
+    value = cache.get(loop)
+    if value is None:
+        value = cache[loop] = factory()
+    return value
+
+
+def loads_json(json_str: str) -> Any:
+    """
+    Decode json_str, using orjson when it is installed.
+
+    orjson is stricter than the json module, so anything it rejects is decoded again by
+    json.loads with strict=False, which also produces the detailed JSONDecodeError.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(json_str, strict=False)
+
+
+def dumps_json(obj: Any) -> str:
+    """Encode obj as compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+# Operators the arithmetic fast path of parse_expression can evaluate.
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+def _eval_arithmetic(node: ast.AST) -> float:
+    """
+    Evaluate a parsed expression made only of numbers and arithmetic operators.
+    Numbers are floats, so huge powers overflow instead of building enormous integers.
+    Raises ValueError for anything else.
+    """
+    if isinstance(node, ast.Expression):
+        return _eval_arithmetic(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return float(node.value)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        result = _BIN_OPS[type(node.op)](_eval_arithmetic(node.left), _eval_arithmetic(node.right))
+        if isinstance(result, complex):
+            # Fractional powers of negative numbers; left to sympy.
+            raise ValueError("complex result")
+        return result
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_arithmetic(node.operand))
+    raise ValueError(f"unsupported expression node {type(node).__name__}")
+
+
+@functools.lru_cache(maxsize=256)
+def parse_expression(expression_str: str) -> Any:
     """
     Evaluates a mathematical expression given as a string and returns the numerical result.
     This is just in case the AI returns a math expression.
 
+    Plain arithmetic is evaluated directly, anything else (constants, functions, ^ as a power...)
+    is handed to sympy.
+
     Parameters:
     - expression_str: A string representation of the mathematical expression to evaluate.
 
     Returns:
-    The numerical result of the expression.
+    The numerical result of the expression, as a float or a sympy number.
     """
+    try:
+        return _eval_arithmetic(ast.parse(expression_str.strip(), mode="eval"))
+    except (SyntaxError, ValueError, ArithmeticError):
+        pass
+    # Imported here, since sympy takes a while to import and is rarely needed.
+    import sympy as sp
 
     expr = sp.sympify(expression_str)
     numerical_result = expr.evalf()
@@ -6,19 +6,27 @@
 from __future__ import annotations
 
 from gptfunctionutil import *
+from datetime import timezone
 
 
 import pytest
+
+
+class MyTestLib(GPTFunctionLibrary):
+    @AILibFunction(name='get_time',description='Get the current time and day in UTC.')
+    @LibParam(comment='An interesting, amusing remark.')
+    def get_time(self,comment:str):
+        #This is an example of a decorated coroutine command.
+        return f"{comment}"
+
+
+@pytest.fixture(scope='module')
+def testlib():
+    return MyTestLib()
+
+
 @pytest.mark.asyncio
-async def test_command_function_load():
-    class MyTestLib(GPTFunctionLibrary):
-        @AILibFunction(name='get_time',description='Get the current time and day in UTC.')
-        @LibParam(comment='An interesting, amusing remark.')
-        def get_time(self,comment:str):
-            #This is an example of a decorated coroutine command.
-            return f"{comment}"
-    #pass
-    testlib=MyTestLib()
+async def test_command_function_load(testlib):
     schema = testlib.get_schema()
     assert 'name' in schema[0]
     assert schema[0]['name'] == 'get_time'
@@ -28,15 +36,7 @@ async def test_command_function_load():
 
 
 @pytest.mark.asyncio
-async def test_command_function_errorsload():
-    class MyTestLib(GPTFunctionLibrary):
-        @AILibFunction(name='get_time',description='Get the current time and day in UTC.')
-        @LibParam(comment='An interesting, amusing remark.')
-        def get_time(self,comment:str):
-            #This is an example of a decorated coroutine command.
-            return f"{comment}"
-    #pass
-    testlib=MyTestLib()
+async def test_command_function_errorsload(testlib):
     schema = testlib.get_schema()
     assert 'name' in schema[0]
     assert schema[0]['name'] == 'get_time'
@@ -45,9 +45,12 @@ async def test_command_function_errorsload():
     assert 'is not a valid function' in result
 
 import inspect
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from inspect import Parameter
 import re
+import json
+from types import SimpleNamespace
+import openai
 @pytest.mark.asyncio
 async def test_advanced_objects():
     class MyTestLib2(GPTFunctionLibrary):
@@ -196,6 +199,13 @@ async def test_array_converter_to_schema():
     print(schema)
     assert schema== expected_schema
 
+@pytest.mark.asyncio
+async def test_array_converter_tuple_to_schema():
+    converter = ArrayConverter()
+    param = inspect.Parameter('param', Parameter.POSITIONAL_OR_KEYWORD, annotation=Tuple[int, str])
+    schema=converter.to_schema(param, {})
+    assert schema == {'type': 'array', 'prefixItems': [{'type': 'integer'}, {'type': 'string'}]}
+
 @pytest.mark.asyncio
 async def test_array_converter_from_schema_with_invalid_value():
     converter = ArrayConverter()
@@ -245,3 +255,600 @@ async def test_check_converter():
     result=testlib3.call_by_dict({'name':'get_user','arguments':"{\"targetuser\":\"<@1234567890>\"}"})
     assert result == "1234567890"
 
+
+@pytest.mark.asyncio
+async def test_serialized_coroutines_do_not_overlap():
+    import asyncio
+    running = []
+    class MyTestLib7(GPTFunctionLibrary):
+        @AILibFunction(name='slow_write',description='Write something slowly.',serialize=True)
+        @LibParam(text='Text to write.')
+        async def slow_write(self,text:str):
+            running.append(text)
+            assert len(running) == 1
+            await asyncio.sleep(0.01)
+            running.remove(text)
+            return text
+
+    testlib=MyTestLib7()
+    results=await asyncio.gather(
+        testlib.call_by_dict_async({'name':'slow_write','arguments':"{\"text\":\"a\"}"}),
+        testlib.call_by_dict_async({'name':'slow_write','arguments':"{\"text\":\"b\"}"}),
+    )
+    assert results == ["a", "b"]
+
+@pytest.mark.asyncio
+async def test_tool_calls_respect_max_concurrency():
+    import asyncio
+    running = []
+    peak = []
+    class MyTestLib9(GPTFunctionLibrary):
+        @AILibFunction(name='slow_read',description='Read something slowly.')
+        @LibParam(text='Text to read.')
+        async def slow_read(self,text:str):
+            running.append(text)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(text)
+            return text
+
+    testlib=MyTestLib9(max_concurrency=2)
+    calls=[
+        SimpleNamespace(id=str(i),function=SimpleNamespace(name='slow_read',arguments=f"{{\"text\":\"{i}\"}}"))
+        for i in range(5)
+    ]
+    results=await asyncio.gather(*[testlib.call_by_tool_async(call) for call in calls])
+    assert [r['content'] for r in results] == [str(i) for i in range(5)]
+    assert max(peak) == 2
+
+def test_library_reused_across_event_loops():
+    import asyncio
+    class MyTestLib26(GPTFunctionLibrary):
+        @AILibFunction(name='nap',description='Take a short nap.')
+        async def nap(self):
+            await asyncio.sleep(0.01)
+            return 'rested'
+        @AILibFunction(name='solo_nap',description='Take a short nap alone.',serialize=True)
+        async def solo_nap(self):
+            await asyncio.sleep(0.01)
+            return 'rested'
+
+    async def run(testlib,name):
+        call=SimpleNamespace(id='call_0',function=SimpleNamespace(name=name,arguments='{}'))
+        return await asyncio.gather(*[testlib.call_by_tool_async(call) for _ in range(3)])
+    # The semaphore and serialize lock from the first loop must not be reused by the second.
+    limited,unlimited=MyTestLib26(max_concurrency=1),MyTestLib26()
+    for _ in range(2):
+        assert [r['content'] for r in asyncio.run(run(limited,'nap'))] == ['rested']*3
+        assert [r['content'] for r in asyncio.run(run(unlimited,'solo_nap'))] == ['rested']*3
+
+@pytest.mark.asyncio
+async def test_schema_cache_tracks_enabled():
+    class MyTestLib8(GPTFunctionLibrary):
+        @AILibFunction(name='get_time',description='Get the current time and day in UTC.')
+        @LibParam(comment='An interesting, amusing remark.')
+        def get_time(self,comment:str):
+            return f"{comment}"
+        @AILibFunction(name='get_date',description='Get the current date.')
+        @LibParam(comment='An interesting, amusing remark.')
+        def get_date(self,comment:str):
+            return f"{comment}"
+
+    testlib=MyTestLib8()
+    assert [s['name'] for s in testlib.get_schema()] == ['get_time', 'get_date']
+    testlib.FunctionDict['get_date'].enabled = False
+    assert [s['name'] for s in testlib.get_schema()] == ['get_time']
+    assert json.loads(testlib.get_schema_json()) == testlib.get_schema()
+    assert json.loads(testlib.get_tool_schema_json()) == testlib.get_tool_schema()
+    assert [s['function']['name'] for s in testlib.get_tool_schema()] == ['get_time']
+    testlib.FunctionDict['get_date'].enabled = True
+    assert len(testlib.get_tool_schema()) == 2
+
+@pytest.mark.asyncio
+async def test_datetime_converter_from_schema():
+    converter = DatetimeConverter()
+    schema = {'type': 'string', 'format': 'date-time'}
+    expected = datetime(2018, 11, 13, 20, 20, 39, tzinfo=timezone.utc)
+    assert converter.from_schema("2018-11-13T20:20:39+00:00", schema) == expected
+    assert converter.from_schema("2018-11-13T20:20:39Z", schema) == expected
+    assert converter.from_schema("2018-11-13T20:20:39+0000", schema) == expected
+    assert converter.from_schema("2018-11-13T15:20:39-0500", schema) == expected
+    # Only the "%Y-%m-%dT%H:%M:%S%z" layout is accepted, even where fromisoformat would read the value.
+    for value in [
+        "2018-11-13T20:20:39",
+        "2018-11-13 20:20:39+00:00",
+        "20181113T202039+0000",
+        "2018-11-13T20:20+00:00",
+        "2018-11-13T20:20:39.5+00:00",
+        "2018-11-13T20:20:39+00",
+        "2018-W46-2T20:20:39+00:00",
+    ]:
+        with pytest.raises(ValueError):
+            converter.from_schema(value, schema)
+
+@pytest.mark.asyncio
+async def test_parameter_schema_reused():
+    param = inspect.Parameter('words', Parameter.POSITIONAL_OR_KEYWORD, annotation=List[str])
+    dec = {'description': 'Some words.', 'minItems': 2}
+    first, converter = ConvertStatic.parameter_into_schema('words', param, dec)
+    second, converter2 = ConvertStatic.parameter_into_schema('words', param, dict(dec))
+    assert first == second == {'description': 'Some words.', 'type': 'array', 'items': {'type': 'string'}, 'minItems': 2}
+    assert converter is converter2
+    # Each call gets its own copy, so changing one leaves the cache and the others alone.
+    assert first is not second
+    first['items']['maxLength'] = 3
+    third, _ = ConvertStatic.parameter_into_schema('words', param, dec)
+    assert second == third == {'description': 'Some words.', 'type': 'array', 'items': {'type': 'string'}, 'minItems': 2}
+
+def test_substitutions_replacement_is_used():
+    from gptfunctionutil import convertutil
+
+    class ShortStringConverter(StringConverter):
+        def to_schema(self, param, dec):
+            return {**super().to_schema(param, dec), 'maxLength': 10}
+
+    param = inspect.Parameter('word', Parameter.POSITIONAL_OR_KEYWORD, annotation=str)
+    assert 'maxLength' not in ConvertStatic.parameter_into_schema('word', param, {})[0]
+    original = convertutil.substitutions['str']
+    # A Converter class, as substitutions held before, works as well as an instance.
+    convertutil.substitutions['str'] = ShortStringConverter
+    try:
+        schema, converter = ConvertStatic.parameter_into_schema('word', param, {})
+        assert schema['maxLength'] == 10
+        assert isinstance(converter, ShortStringConverter)
+    finally:
+        convertutil.substitutions['str'] = original
+    assert 'maxLength' not in ConvertStatic.parameter_into_schema('word', param, {})[0]
+
+def test_library_schemas_are_independent():
+    class TagLibA(GPTFunctionLibrary):
+        @AILibFunction(name='tag_a', description='Tag something.')
+        @LibParam(tags='Tags to add.')
+        def tag_a(self, tags: List[str]):
+            return tags
+
+    class TagLibB(GPTFunctionLibrary):
+        @AILibFunction(name='tag_b', description='Tag something else.')
+        @LibParam(tags='Tags to add.')
+        def tag_b(self, tags: List[str]):
+            return tags
+
+    a_items = TagLibA().get_schema()[0]['parameters']['properties']['tags']['items']
+    a_items['maxLength'] = 3
+    assert TagLibB().get_schema()[0]['parameters']['properties']['tags']['items'] == {'type': 'string'}
+    assert ArrayConverter().to_schema(Parameter('tags', Parameter.POSITIONAL_OR_KEYWORD, annotation=List[str]), {}) == {
+        'type': 'array',
+        'items': {'type': 'string'},
+    }
+
+@pytest.mark.asyncio
+async def test_specialized_validators_match_from_schema():
+    numeric = NumericConverter()
+    schema = {'type': 'integer', 'minimum': 0, 'exclusiveMaximum': 10, 'multipleOf': 2}
+    validate = numeric.specialize(schema)
+    for value in [0, 4, 8]:
+        assert validate(value) == numeric.from_schema(value, schema)
+    for value in [-2, 3, 10, 'a']:
+        with pytest.raises(ValueError):
+            validate(value)
+    string = StringConverter()
+    schema = {'type': 'string', 'maxLength': 5, 'pattern': r'^[a-z]+$'}
+    validate = string.specialize(schema)
+    assert validate('abc') == 'abc'
+    for value in ['toolong', 'ABC', 3]:
+        with pytest.raises(ValueError):
+            validate(value)
+
+@pytest.mark.asyncio
+async def test_parse_name_args_bad_json():
+    class MyTestLib10(GPTFunctionLibrary):
+        @AILibFunction(name='get_time',description='Get the current time and day in UTC.')
+        @LibParam(comment='An interesting, amusing remark.')
+        def get_time(self,comment:str):
+            return f"{comment}"
+
+    testlib=MyTestLib10()
+    with pytest.raises(ArgDecodeError) as excinfo:
+        testlib.parse_name_args({'name':'get_time','arguments':"{comment:'hi'}"})
+    assert excinfo.value.function_name == 'get_time'
+    with pytest.raises(FunctionNotFound):
+        testlib.parse_name_args({'name':'get_date','arguments':"{}"})
+    assert testlib.parse_name_args({'name':'get_time','arguments':"{\"comment\": \"a \\\\n b\"}"}) == ('get_time', {'comment': 'a \\n b'})
+    testlib.do_expression = True
+    assert testlib.parse_name_args({'name':'get_time','arguments':"{\"comment\": 2*3}"}) == ('get_time', {'comment': 6.0})
+    result = testlib.parse_name_args({'name':'get_time','arguments':'{"comment": "say "hi"", "count": 2*3}'})
+    assert result == ('get_time', {'comment': 'say "hi"', 'count': 6.0})
+
+@pytest.mark.asyncio
+async def test_force_words():
+    class MyTestLib11(GPTFunctionLibrary):
+        @AILibFunction(name='get_time',description='Get the current time and day in UTC.',force_words=['clock', 'c++'])
+        @LibParam(comment='An interesting, amusing remark.')
+        def get_time(self,comment:str):
+            return f"{comment}"
+        @AILibFunction(name='get_date',description='Get the current date.',force_words=['calendar'])
+        @LibParam(comment='An interesting, amusing remark.')
+        def get_date(self,comment:str):
+            return f"{comment}"
+
+    testlib=MyTestLib11()
+    command = testlib.FunctionDict['get_time']
+    assert command.check_force("What does the Clock say?")
+    assert not command.check_force("clockwork")
+    assert testlib.force_word_check("show me the calendar")[0]['function']['name'] == 'get_date'
+    assert testlib.force_word_check("nothing to see here") is None
+    assert testlib.force_word_check("calendar or clock?")[0]['function']['name'] == 'get_time'
+    command.force_words = ['watch']
+    assert command.check_force("check my watch")
+    assert not command.check_force("What does the clock say?")
+
+    # Overlapping words of different commands are all found, and the earlier command still wins.
+    class MyTestLib24(GPTFunctionLibrary):
+        @AILibFunction(name='a',description='Give a report.',force_words=['report'])
+        def a(self):
+            return 'a'
+        @AILibFunction(name='b',description='Give the weather.',force_words=['weather report'])
+        def b(self):
+            return 'b'
+    assert MyTestLib24().force_word_check("give me the weather report")[0]['function']['name'] == 'a'
+
+@pytest.mark.asyncio
+async def test_function_dict_per_class():
+    class MyTestLib12(GPTFunctionLibrary):
+        @AILibFunction(name='get_time',description='Get the current time and day in UTC.')
+        @LibParam(comment='An interesting, amusing remark.')
+        def get_time(self,comment:str):
+            return f"{comment}"
+    class MyTestLib13(MyTestLib12):
+        @AILibFunction(name='get_date',description='Get the current date.')
+        @LibParam(comment='An interesting, amusing remark.')
+        def get_date(self,comment:str):
+            return f"{comment}"
+
+    assert list(MyTestLib12().FunctionDict) == ['get_time']
+    assert list(MyTestLib13().FunctionDict) == ['get_time', 'get_date']
+    first, second = MyTestLib12(), MyTestLib12()
+    first.FunctionDict.pop('get_time')
+    assert list(second.FunctionDict) == ['get_time']
+
+@pytest.mark.asyncio
+async def test_coroutine_args_are_converted():
+    class MyTestLib14(GPTFunctionLibrary):
+        @AILibFunction(name='set_alarm',description='Set an alarm.')
+        @LibParam(alarm_time='Datetime to set this alarm at.')
+        async def set_alarm(self,alarm_time:datetime):
+            return alarm_time.date().isoformat()
+
+    testlib=MyTestLib14()
+    result=await testlib.call_by_dict_async({'name':'set_alarm','arguments':"{\"alarm_time\":\"2018-11-13T20:20:39+00:00\"}"})
+    assert result == "2018-11-13"
+
+@pytest.mark.asyncio
+async def test_array_converter_from_schema_unique_items():
+    converter = ArrayConverter()
+    schema = {'type': 'array', 'uniqueItems': True}
+    assert converter.from_schema(['a', 'b', 'c'], schema) == ['a', 'b', 'c']
+    with pytest.raises(ValueError):
+        converter.from_schema(['a', 'b', 'a', 'c'], schema)
+
+@pytest.mark.asyncio
+async def test_builtin_generic_annotations():
+    class MyTestLib9(GPTFunctionLibrary):
+        @AILibFunction(name='count_words',description='Count a list of words.')
+        @LibParam(words='The words to count.')
+        def count_words(self,words:list[str]):
+            return len(words)
+
+    testlib=MyTestLib9()
+    schema = testlib.get_schema()
+    assert schema[0]['parameters']['properties']['words']['type'] == 'array'
+    assert schema[0]['parameters']['properties']['words']['items'] == {'type': 'string'}
+    result=testlib.call_by_dict({'name':'count_words','arguments':"{\"words\":[\"a\",\"b\"]}"})
+    assert result == 2
+
+@pytest.mark.asyncio
+async def test_call_without_arguments():
+    class MyTestLib15(GPTFunctionLibrary):
+        @AILibFunction(name='ping',description='Check that the library responds.')
+        def ping(self):
+            return "pong"
+        @AILibFunction(name='ping_async',description='Check that the library responds.')
+        async def ping_async(self):
+            return "pong"
+
+    testlib=MyTestLib15()
+    assert testlib.call_by_dict({'name':'ping','arguments':"{}"}) == "pong"
+    assert testlib.call_by_dict({'name':'ping'}) == "pong"
+    assert testlib.parse_name_args({'name':'ping','arguments':{}}) == ('ping', {})
+    assert await testlib.call_by_dict_async({'name':'ping_async','arguments':"{}"}) == "pong"
+
+@pytest.mark.asyncio
+async def test_call_by_dict_ctx_converts_method_args():
+    class MyTestLib16(GPTFunctionLibrary):
+        @AILibFunction(name='set_alarm',description='Set an alarm.')
+        @LibParam(alarm_time='Datetime to set this alarm at.')
+        async def set_alarm(self,alarm_time:datetime):
+            return alarm_time.date().isoformat()
+
+    testlib=MyTestLib16()
+    if not hasattr(testlib, 'call_by_dict_ctx'):
+        pytest.skip('discord.py is not installed')
+    result=await testlib.call_by_dict_ctx(None, {'name':'set_alarm','arguments':"{\"alarm_time\":\"2018-11-13T20:20:39+00:00\"}"})
+    assert result == "2018-11-13"
+
+@pytest.mark.asyncio
+async def test_call_many_by_dict_ctx():
+    import asyncio
+    class MyTestLib17(GPTFunctionLibrary):
+        @AILibFunction(name='double',description='Double a number.')
+        @LibParam(number='The number to double.')
+        async def double(self,number:int):
+            await asyncio.sleep(0.01)
+            return number*2
+
+    testlib=MyTestLib17()
+    if not hasattr(testlib, 'call_many_by_dict_ctx'):
+        pytest.skip('discord.py is not installed')
+    calls=[{'name':'double','arguments':json.dumps({'number':i})} for i in range(3)]
+    calls.append({'name':'missing','arguments':"{}"})
+    results=await testlib.call_many_by_dict_ctx(None, calls)
+    assert results[:3] == [0, 2, 4]
+    assert 'missing is not a valid function.' in results[3]
+
+@pytest.mark.asyncio
+async def test_call_many_by_dict_ctx_commands_share_ctx():
+    import asyncio
+    if not hasattr(GPTFunctionLibrary, 'call_many_by_dict_ctx'):
+        pytest.skip('discord.py is not installed')
+    from discord.ext import commands
+
+    @AILibFunction(name='first',description='The first command.')
+    @LibParam(word='A word.')
+    @commands.command(name='first')
+    async def first(ctx,word:str):
+        pass
+
+    @AILibFunction(name='second',description='The second command.')
+    @LibParam(word='A word.')
+    @commands.command(name='second')
+    async def second(ctx,word:str):
+        pass
+
+    invoked=[]
+    async def invoke(command,**kwargs):
+        seen=(ctx.command.name,dict(ctx.kwargs))
+        await asyncio.sleep(0.01)
+        # Nothing else may have changed ctx while the command was running.
+        assert (ctx.command.name,ctx.kwargs) == seen == (command.name,kwargs)
+        invoked.append(seen)
+        return command.name
+
+    async def can_run(ctx,call_once=False):
+        return True
+    all_commands={'first':first,'second':second}
+    bot=SimpleNamespace(walk_commands=lambda:[first,second],get_command=all_commands.get,all_commands=all_commands,
+                        dispatch=lambda *args:None,can_run=can_run)
+    ctx=SimpleNamespace(bot=bot,invoke=invoke,command=None,kwargs={})
+
+    class MyTestLib23(GPTFunctionLibrary):
+        pass
+    testlib=MyTestLib23()
+    testlib.add_in_commands(bot)
+    calls=[{'name':'first','arguments':'{"word":"one"}'},{'name':'second','arguments':'{"word":"two"}'}]
+    assert await testlib.call_many_by_dict_ctx(ctx,calls) == ['first','second']
+    assert invoked == [('first',{'word':'one'}),('second',{'word':'two'})]
+
+def fake_completion(*tool_calls):
+    """A chat completion whose message calls each (name, arguments) pair in tool_calls."""
+    tools=[SimpleNamespace(id=f'call_{i}',function=SimpleNamespace(name=name,arguments=arguments))
+           for i,(name,arguments) in enumerate(tool_calls)]
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=tools))])
+
+def fake_caller(cls, mylib, create, **kwargs):
+    """A SingleCall or SingleCallAsync that gets its responses from create instead of the API."""
+    caller=cls(mylib,client=openai.AsyncClient(api_key='test') if cls._is_async else openai.Client(api_key='test'),**kwargs)
+    client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    if cls._is_async:
+        caller.a_client=client
+    else:
+        caller.client=client
+    return caller
+
+@pytest.mark.asyncio
+async def test_single_call_cache():
+    class MyTestLib18(GPTFunctionLibrary):
+        @AILibFunction(name='get_time',description='Get the current time and day in UTC.')
+        @LibParam(comment='An interesting, amusing remark.')
+        def get_time(self,comment:str):
+            return comment
+
+    requests=[]
+    def create(**kwargs):
+        requests.append(kwargs)
+        return fake_completion(('get_time','{"comment":"hi"}'))
+
+    caller=fake_caller(SingleCall,MyTestLib18(),create,cache={})
+    first=caller.call_single('What time is it?')
+    assert first[0][1]['content'] == 'hi'
+    assert caller.call_single('What time is it?') == first
+    assert len(requests) == 1
+    caller.call_single('What day is it?')
+    assert len(requests) == 2
+
+def test_single_call_async_cache_is_keyword_only():
+    client = openai.AsyncClient(api_key='test')
+    # cache is SingleCall_Core's sixth positional argument, it can't silently land in max_connections here.
+    with pytest.raises(TypeError):
+        SingleCallAsync(MyTestLib(), client, 'gpt-4o-mini', 'You are a helpful assistant.', None, {})
+    cache = {}
+    caller = SingleCallAsync(MyTestLib(), client, cache=cache, max_concurrency=4)
+    assert caller.cache is cache and caller.max_concurrency == 4
+
+@pytest.mark.asyncio
+async def test_parse_expression():
+    from gptfunctionutil.util import parse_expression
+    assert parse_expression('2*3') == 6.0
+    assert parse_expression('-(1+2)/4') == -0.75
+    # Anything past plain arithmetic is still evaluated by sympy.
+    assert float(parse_expression('2^3')) == 8.0
+    assert float(parse_expression('sqrt(16)')) == 4.0
+
+@pytest.mark.asyncio
+async def test_single_call_from_client():
+    class MyTestLib19(GPTFunctionLibrary):
+        pass
+
+    caller=SingleCallAsync.from_client(MyTestLib19(),openai.AsyncClient(api_key='test'))
+    assert caller.a_client is not None and caller.client is None
+    with pytest.raises(WrongClient):
+        SingleCall.from_client(MyTestLib19(),openai.AsyncClient(api_key='test'))
+    # The timeout is set on the client once, and a timeout of 0 is not ignored.
+    caller=SingleCall(MyTestLib19(),client=openai.Client(api_key='test'),timeout=0)
+    assert caller.client.timeout == 0
+    assert 'timeout' not in caller.format_kwargs('Hello.','auto')
+
+@pytest.mark.asyncio
+async def test_single_call_stream():
+    class MyTestLib20(GPTFunctionLibrary):
+        @AILibFunction(name='echo',description='Repeat a word.')
+        @LibParam(word='The word to repeat.')
+        async def echo(self,word:str):
+            return word
+
+    def delta(index,id=None,name=None,arguments=None):
+        function=SimpleNamespace(name=name,arguments=arguments)
+        tool=SimpleNamespace(index=index,id=id,function=function)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(tool_calls=[tool]))])
+
+    async def chunks():
+        yield delta(0,'call_1','echo','{"word":')
+        yield delta(0,arguments='"one"}')
+        yield delta(1,'call_2','echo','{"word":"two"}')
+        yield SimpleNamespace(choices=[])
+
+    async def create(**kwargs):
+        assert kwargs['stream']
+        return chunks()
+
+    caller=fake_caller(SingleCallAsync,MyTestLib20(),create)
+    result=await caller.call_single('Say one and two.',stream=True)
+    assert [(name,output['content']) for name,output in result] == [('echo','one'),('echo','two')]
+    assert result[1][1]['tool_call_id'] == 'call_2'
+
+@pytest.mark.asyncio
+async def test_single_call_many():
+    import time
+    running=[]
+    class MyTestLib21(GPTFunctionLibrary):
+        @AILibFunction(name='echo',description='Repeat a word.',serialize=True)
+        @LibParam(word='The word to repeat.')
+        def echo(self,word:str):
+            running.append(word)
+            time.sleep(0.001)
+            assert running == [word]
+            running.remove(word)
+            return word
+
+    def create(**kwargs):
+        return fake_completion(('echo',json.dumps({'word':kwargs['messages'][1]['content']})))
+
+    words=[str(i) for i in range(20)]
+    caller=fake_caller(SingleCall,MyTestLib21(),create)
+    results=caller.call_many(words,max_concurrency=4)
+    # Same output as call_single, and the serialized tool never ran in two threads at once.
+    assert results[0] == caller.call_single('0')
+    assert [result[0][1]['content'] for result in results] == words
+
+@pytest.mark.asyncio
+async def test_single_call_iter():
+    import asyncio
+    class MyTestLib22(GPTFunctionLibrary):
+        @AILibFunction(name='wait',description='Wait, then return the word.')
+        @LibParam(word='The word to return.',seconds='How long to wait.')
+        async def wait(self,word:str,seconds:float):
+            await asyncio.sleep(seconds)
+            return word
+
+    async def create(**kwargs):
+        return fake_completion(('wait','{"word":"slow","seconds":0.05}'),('wait','{"word":"fast","seconds":0}'))
+
+    caller=fake_caller(SingleCallAsync,MyTestLib22(),create)
+    # call_single keeps the API's order, call_single_iter yields whichever tool finishes first.
+    assert [output['content'] for _,output in await caller.call_single('Wait.')] == ['slow','fast']
+    assert [output['content'] async for _,output in caller.call_single_iter('Wait.')] == ['fast','slow']
+
+def test_single_call_batch_reused_across_event_loops():
+    import asyncio
+    class MyTestLib27(GPTFunctionLibrary):
+        @AILibFunction(name='nap',description='Take a short nap.')
+        async def nap(self):
+            await asyncio.sleep(0.01)
+            return 'rested'
+
+    async def create(**kwargs):
+        await asyncio.sleep(0.01)
+        return fake_completion(('nap','{}'))
+    caller=fake_caller(SingleCallAsync,MyTestLib27(),create,max_concurrency=1)
+    # The batch semaphore from the first loop must not be reused by the second.
+    for _ in range(2):
+        results=asyncio.run(caller.call_single_batch(['Nap.']*3))
+        assert [result[0][1]['content'] for result in results] == ['rested']*3
+
+@pytest.mark.asyncio
+async def test_shared_async_client_per_loop():
+    import asyncio
+    async def get():
+        return get_shared_async_client(api_key='test')
+    client=await get()
+    assert client is await get()
+    # Another event loop gets its own client, since connections can't move between loops.
+    assert await asyncio.to_thread(asyncio.run,get()) is not client
+    await aclose_shared_clients()
+    assert await get() is not client
+    await aclose_shared_clients()
+
+@pytest.mark.asyncio
+async def test_single_call_cancels_tools_after_error():
+    import asyncio
+    cancelled=[]
+    class MyTestLib25(GPTFunctionLibrary):
+        @AILibFunction(name='fail',description='Fail.')
+        async def fail(self):
+            raise ValueError('failed')
+        @AILibFunction(name='slow',description='Take a while.')
+        async def slow(self):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append('slow')
+                raise
+
+    async def create(**kwargs):
+        return fake_completion(('slow','{}'),('fail','{}'))
+
+    caller=fake_caller(SingleCallAsync,MyTestLib25(),create)
+    with pytest.raises(ValueError):
+        await caller.call_single('Go.')
+    # The slow tool was cancelled and waited for, not left running.
+    assert cancelled == ['slow']
+
+@pytest.mark.asyncio
+async def test_resolve_command_after_removal():
+    if not hasattr(GPTFunctionLibrary, 'call_many_by_dict_ctx'):
+        pytest.skip('discord.py is not installed')
+    import discord
+    from discord.ext import commands
+
+    @AILibFunction(name='ping',description='Ping.')
+    @commands.command(name='ping')
+    async def ping(ctx):
+        pass
+
+    bot=commands.Bot(command_prefix='!',intents=discord.Intents.none())
+    bot.add_command(ping)
+    libcommand=ping.extras['libcommand']
+    assert libcommand.resolve_command(bot) is ping
+    assert libcommand.resolve_command(bot) is ping
+    # A removed command isn't used from the cache.
+    bot.remove_command('ping')
+    assert libcommand.resolve_command(bot) is None